@@ -29,6 +29,8 @@
 
 """
 
+import numpy as np
+
 from . import angle
 from . import const
 from . import props
@@ -95,6 +97,31 @@ def _aspectDict(obj1, obj2, aspList):
 
     return None
 
+def allowedOrb(obj1, obj2, asp):
+    """ Returns the maximum orb allowed for an aspect
+    between two objects, or -1 if the aspect is not 
+    allowed. The active object is selected as in 
+    getAspect and it follows the rules of _aspectDict.
+    
+    """
+    active = _getActivePassive(obj1, obj2)['active']
+    if active.id == const.SYZYGY:
+        return -1.0
+
+    # Fixed stars only allow for conjunctions
+    if obj1.type == const.OBJ_FIXED_STAR or obj2.type == const.OBJ_FIXED_STAR:
+        if asp != const.CONJUNCTION:
+            return -1.0
+
+    # Only conjunctions for Pars Fortuna and Nodes
+    if active.id in [const.PARS_FORTUNA, const.NORTH_NODE, const.SOUTH_NODE] and asp != const.CONJUNCTION:
+        return -1.0
+
+    if asp in const.MAJOR_ASPECTS:
+        return max(obj1.orb(), obj2.orb())
+    return MAX_MINOR_ASP_ORB
+
+
 def _aspectProperties(obj1, obj2, aspDict):
     orb = aspDict['orb']
     asp = aspDict['type']
@@ -241,18 +268,107 @@ def getStarConjunction(obj1, obj2, max_orb=1.0):
         }
     return None
 
+def _activeSpeed(obj):
+    """ Returns the speed used to select the active
+    object, as in _getActivePassive.
+    
+    """
+    if not hasattr(obj, 'isPlanet'):
+        return 0
+    return abs(obj.lonspeed) if obj.isPlanet() else -1.0
+
+
+def _aspectIndexes(objs, aspList):
+    """ Returns a list of (activeIdx, passiveIdx, aspDict)
+    with the aspects between all pairs of objects, and
+    the array of speeds used to select active objects.
+    
+    It computes all separations and orbs at once with 
+    numpy arrays and gives the same results as getAspect 
+    for each pair. Each pair is included only once, 
+    except when both objects have the same speed and the
+    aspect depends on which one is active.
+    
+    """
+    n = len(objs)
+    speed = np.array([_activeSpeed(obj) for obj in objs], dtype=np.float64)
+    if n < 2 or not aspList:
+        return [], speed
+
+    lon = np.array([obj.lon for obj in objs], dtype=np.float64)
+    orb = np.array([obj.orb() for obj in objs], dtype=np.float64)
+    star = np.array([obj.type == const.OBJ_FIXED_STAR for obj in objs])
+    conjOnly = np.array([obj.id in [const.PARS_FORTUNA, const.NORTH_NODE,
+                                    const.SOUTH_NODE] for obj in objs])
+    syzygy = np.array([obj.id == const.SYZYGY for obj in objs])
+
+    # Active and passive indexes for every pair (i < j), as
+    # getAspect(objs[i], objs[j]). Ties also get the reverse.
+    i, j = np.triu_indices(n, k=1)
+    act = np.where(speed[i] > speed[j], i, j)
+    pas = np.where(speed[i] > speed[j], j, i)
+    tie = speed[i] == speed[j]
+    act = np.concatenate([act, i[tie]])
+    pas = np.concatenate([pas, j[tie]])
+
+    # Separations from active to passive
+    sep = np.mod(lon[pas] - lon[act], 360)
+    sep = np.where(sep <= 180, sep, sep - 360)
+    absSep = np.abs(sep)
+
+    # Orbs and validity of each aspect type
+    asps = np.array(aspList, dtype=np.float64)
+    orbs = np.abs(absSep[:, None] - asps[None, :])
+    conj = (asps == const.CONJUNCTION)[None, :]
+    major = np.array([asp in const.MAJOR_ASPECTS for asp in aspList])[None, :]
+    inOrb = np.where(major,
+                     (orbs <= orb[act][:, None]) | (orbs <= orb[pas][:, None]),
+                     orbs <= MAX_MINOR_ASP_ORB)
+    valid = inOrb & ~syzygy[act][:, None]
+    valid &= conj | ~(star[act] | star[pas])[:, None]
+    valid &= conj | ~conjOnly[act][:, None]
+
+    # The first valid aspect type of each pair
+    hits = np.flatnonzero(valid.any(axis=1))
+    first = valid[hits].argmax(axis=1)
+
+    res = []
+    seen = set()
+    for k, t in zip(hits.tolist(), first.tolist()):
+        a, p = int(act[k]), int(pas[k])
+        key = (a, p, t)
+        if key in seen:
+            continue
+        seen.add(key)
+        res.append((a, p, {
+            'type': aspList[t],
+            'orb': float(orbs[k, t]),
+            'separation': float(sep[k]),
+        }))
+    return res, speed
+
+
+def aspectPairs(objs, aspList):
+    """ Returns a list of (active, passive, aspDict) with
+    the aspects between all pairs of objects, considering
+    a list of possible aspect types. 
+    
+    """
+    indexes, _ = _aspectIndexes(objs, aspList)
+    return [(objs[a], objs[p], aspDict) for (a, p, aspDict) in indexes]
+
+
 def getAllAspects(objList, aspList):
-    aspect_list = []
-    for obj1 in objList.values():  # Ensure that objList is a dictionary of object instances
-        for obj2 in objList.values():
-            if not hasattr(obj1, 'id') or not hasattr(obj2, 'id'):
-                raise TypeError(f"Expected object with 'id', but got {type(obj1)} and {type(obj2)}")
-            if obj1 == obj2:
-                continue  # skip same object comparison
-            aspect = getAspect(obj1, obj2, aspList)
-            if aspect and aspect.exists():
-                aspect_list.append(aspect)
-    return aspect_list
+    """ Returns a list with the aspects between all the
+    objects in a dict, each pair being included once.
+    
+    """
+    objs = list(objList.values())
+    for obj in objs:
+        if not hasattr(obj, 'id'):
+            raise TypeError(f"Expected object with 'id', but got {type(obj)}")
+    return [Aspect(_aspectProperties(active, passive, aspDict))
+            for (active, passive, aspDict) in aspectPairs(objs, aspList)]
 
 # ---------------- #
 #   Aspect Class   #
@@ -340,3 +456,84 @@ class Aspect:
                                      props.aspect.name.get(self.type) + ' (' + str(self.type) +')',
                                      self.active.movement,
                                      angle.toString(self.orb))
+
+
+# -------------------- #
+#   AspectGrid Class   #
+# -------------------- #
+
+class AspectGrid:
+    """ This class represents the aspects between all 
+    pairs of objects of a list, considering a list of
+    possible aspect types.
+    
+    The type, orb and separation of each pair are stored
+    in compact arrays indexed by the active and passive 
+    objects, and Aspect objects are only built from them
+    when requested.
+    
+    """
+
+    def __init__(self, objs, aspList):
+        self.objs = list(objs)
+        self.aspList = list(aspList)
+        self.index = {obj.id: i for (i, obj) in enumerate(self.objs)}
+
+        n = len(self.objs)
+        self.type = np.full((n, n), const.NO_ASPECT, dtype=np.int16)
+        self.orb = np.zeros((n, n))
+        self.separation = np.zeros((n, n))
+        self.pairs = []
+
+        indexes, self.speed = _aspectIndexes(self.objs, self.aspList)
+        for (a, p, aspDict) in indexes:
+            self.type[a, p] = aspDict['type']
+            self.orb[a, p] = aspDict['orb']
+            self.separation[a, p] = aspDict['separation']
+            self.pairs.append((a, p))
+
+    def _activePassive(self, ID1, ID2):
+        """ Returns the active and passive indexes of two
+        objects, as in _getActivePassive.
+        
+        """
+        i, j = self.index[ID1], self.index[ID2]
+        if self.speed[i] > self.speed[j]:
+            return (i, j)
+        return (j, i)
+
+    def aspectType(self, ID1, ID2):
+        """ Returns the aspect type between two objects. """
+        a, p = self._activePassive(ID1, ID2)
+        return int(self.type[a, p])
+
+    def hasAspect(self, ID1, ID2):
+        """ Returns if there is an aspect between objects. """
+        return self.aspectType(ID1, ID2) != const.NO_ASPECT
+
+    def getAspect(self, ID1, ID2):
+        """ Returns an Aspect object for the aspect between
+        two objects, as the getAspect function.
+        
+        """
+        a, p = self._activePassive(ID1, ID2)
+        if self.type[a, p] == const.NO_ASPECT:
+            return getAspect(self.objs[p], self.objs[a], self.aspList)
+        return self._newAspect(a, p)
+
+    def getAspects(self):
+        """ Returns a list with all the existing aspects. """
+        return [self._newAspect(a, p) for (a, p) in self.pairs]
+
+    def _newAspect(self, a, p):
+        """ Builds the Aspect of an active and passive pair
+        from the stored arrays.
+        
+        """
+        aspDict = {
+            'type': int(self.type[a, p]),
+            'orb': float(self.orb[a, p]),
+            'separation': float(self.separation[a, p]),
+        }
+        prop = _aspectProperties(self.objs[a], self.objs[p], aspDict)
+        return Aspect(prop)
@@ -0,0 +1,290 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements the ChartBatch class, which
+    stores many charts as columns of numpy arrays for
+    population-level analysis.
+
+    Object positions are stored in arrays of shape
+    (charts, objects), house cusps in arrays of shape
+    (charts, 12) and angles in arrays of shape (charts, 4),
+    in the order of const.LIST_ANGLES. Queries such as
+    signs, house placements, diurnal charts, moon phases
+    and essential dignities are computed for the whole
+    batch at once. Individual Chart objects are only
+    built when requested.
+
+"""
+
+import numpy as np
+
+from . import const
+from .chart import Chart
+from .geopos import GeoPos
+from .dignities import essential
+from .ephem import eph
+from .ephem import swe
+from .object import House
+
+# The earth's inclination (as utils.eqCoords)
+_EPSILON = np.radians(23.44)
+
+# Moon phases by quadrant
+MOON_PHASES = [
+    const.MOON_FIRST_QUARTER,
+    const.MOON_SECOND_QUARTER,
+    const.MOON_THIRD_QUARTER,
+    const.MOON_LAST_QUARTER
+]
+
+
+# === Private functions === #
+
+def _eqCoords(lon, lat):
+    """ Converts arrays of ecliptical coordinates to
+    equatorial coordinates, as utils.eqCoords.
+
+    """
+    _lambda = np.radians(lon)
+    _beta = np.radians(lat)
+    decl = np.arcsin(np.sin(_EPSILON) * np.sin(_lambda) * np.cos(_beta) +
+                     np.cos(_EPSILON) * np.sin(_beta))
+    ED = np.arccos(np.clip(np.cos(_lambda) * np.cos(_beta) / np.cos(decl),
+                           -1, 1))
+    ra = np.where(lon < 180, ED, 2 * np.pi - ED)
+
+    # Correctness of RA if longitude is close to 0º or 180º
+    near = ((np.abs((lon + 180) % 360 - 180) < 5) |
+            (np.abs(lon % 360 - 180) < 5))
+    a = np.sin(ra) * np.cos(decl)
+    b = (np.cos(_EPSILON) * np.sin(_lambda) * np.cos(_beta) -
+         np.sin(_EPSILON) * np.sin(_beta))
+    ra = np.where(near & (np.abs(a - b) > 0.0003), 2 * np.pi - ra, ra)
+    return (np.degrees(ra), np.degrees(decl))
+
+
+# -------------------- #
+#   ChartBatch Class   #
+# -------------------- #
+
+class ChartBatch:
+    """ This class represents a batch of charts stored
+    in columns.
+
+    """
+
+    def __init__(self, IDs, jd, utcoffsets, geolat, geolon, hsys,
+                 lon, lat, lonspeed, latspeed, houses, angles):
+        self.IDs = list(IDs)
+        self.index = {ID: i for (i, ID) in enumerate(self.IDs)}
+        self.hsys = hsys
+
+        # Dates and locations (charts)
+        self.jd = jd
+        self.utcoffsets = utcoffsets
+        self.geolat = geolat
+        self.geolon = geolon
+
+        # Objects (charts, objects)
+        self.lon = lon
+        self.lat = lat
+        self.lonspeed = lonspeed
+        self.latspeed = latspeed
+
+        # Houses (charts, 12) and angles (charts, 4)
+        self.houses = houses
+        self.angles = angles
+
+    @classmethod
+    def fromCharts(cls, charts, IDs=None):
+        """ Builds a batch from a list of charts. All charts
+        must have the same house system.
+
+        """
+        charts = list(charts)
+        if IDs is None:
+            IDs = [ID for ID in charts[0].objects
+                   if charts[0].objects[ID].type != const.OBJ_FIXED_STAR]
+        cols = [[chart.getObject(ID) for ID in IDs] for chart in charts]
+        return cls(
+            IDs,
+            np.array([chart.date.jd for chart in charts]),
+            [chart.date.utcoffset for chart in charts],
+            np.array([chart.pos.lat for chart in charts]),
+            np.array([chart.pos.lon for chart in charts]),
+            charts[0].hsys,
+            np.array([[obj.lon for obj in row] for row in cols]),
+            np.array([[obj.lat for obj in row] for row in cols]),
+            np.array([[obj.lonspeed for obj in row] for row in cols]),
+            np.array([[obj.latspeed for obj in row] for row in cols]),
+            np.array([[house.lon for house in chart.houses]
+                      for chart in charts]),
+            np.array([[chart.getAngle(ID).lon for ID in const.LIST_ANGLES]
+                      for chart in charts])
+        )
+
+    @classmethod
+    def build(cls, dates, positions, IDs=const.LIST_OBJECTS_TRADITIONAL,
+              hsys=const.HOUSES_DEFAULT):
+        """ Builds a batch from lists of dates and positions
+        using the batch ephemeris. A single position may be
+        given for all dates.
+
+        """
+        dates = list(dates)
+        if isinstance(positions, GeoPos):
+            positions = [positions] * len(dates)
+        jd = np.array([date.jd for date in dates])
+        geolat = np.array([pos.lat for pos in positions])
+        geolon = np.array([pos.lon for pos in positions])
+
+        n = len(dates)
+        shape = (n, len(IDs))
+        lon, lat = np.zeros(shape), np.zeros(shape)
+        lonspeed, latspeed = np.zeros(shape), np.zeros(shape)
+
+        def fill(arrays, rows):
+            for ID in arrays:
+                i = IDs.index(ID)
+                lon[rows, i] = arrays[ID]['lon']
+                lat[rows, i] = arrays[ID]['lat']
+                lonspeed[rows, i] = arrays[ID]['lonspeed']
+                latspeed[rows, i] = arrays[ID]['latspeed']
+
+        # Objects which do not depend on the location are
+        # fetched for all dates in a single batch
+        common = [ID for ID in IDs if ID in swe.SWE_OBJECTS or
+                  ID in [const.SOUTH_NODE, const.SYZYGY]]
+        derived = [ID for ID in IDs if ID not in common]
+        if common:
+            fill(eph.getObjectArrays(common, jd, 0, 0), np.arange(n))
+
+        # Derived objects are fetched for each distinct location
+        if derived:
+            locations = np.stack([geolat, geolon], axis=1)
+            unique, inverse = np.unique(locations, axis=0, return_inverse=True)
+            for k, (glat, glon) in enumerate(unique.tolist()):
+                rows = np.flatnonzero(inverse.ravel() == k)
+                fill(eph.getObjectArrays(derived, jd[rows], glat, glon), rows)
+
+        houses = np.zeros((n, 12))
+        angles = np.zeros((n, 4))
+        for i in range(n):
+            hlist, alist = swe.sweHousesLon(jd[i], geolat[i], geolon[i], hsys)
+            houses[i] = hlist[:12]
+            angles[i] = alist
+
+        return cls(IDs, jd, [date.utcoffset for date in dates],
+                   geolat, geolon, hsys, lon, lat, lonspeed, latspeed,
+                   houses, angles)
+
+    # === Charts === #
+
+    def __len__(self):
+        return len(self.jd)
+
+    def getChart(self, i):
+        """ Returns the chart at an index. """
+        houses = self.houses[i].tolist()
+        sizes = np.mod(np.roll(self.houses[i], -1) - self.houses[i], 360)
+        objects = [{
+            'id': ID,
+            'type': const.OBJ_PLANET,
+            'lon': float(self.lon[i, j]),
+            'lat': float(self.lat[i, j]),
+            'lonspeed': float(self.lonspeed[i, j]),
+            'latspeed': float(self.latspeed[i, j]),
+        } for (j, ID) in enumerate(self.IDs)]
+        return Chart.fromDict({
+            'date': (float(self.jd[i]), self.utcoffsets[i].value),
+            'pos': (float(self.geolat[i]), float(self.geolon[i])),
+            'hsys': self.hsys,
+            'objects': objects,
+            'houses': [{'id': const.LIST_HOUSES[k], 'lon': houses[k],
+                        'size': float(sizes[k])} for k in range(12)],
+            'angles': [{'id': ID, 'lon': float(self.angles[i, k])}
+                       for (k, ID) in enumerate(const.LIST_ANGLES)],
+        })
+
+    def __iter__(self):
+        """ Yields the charts of this batch. """
+        for i in range(len(self)):
+            yield self.getChart(i)
+
+    # === Queries === #
+
+    def getLon(self, ID):
+        """ Returns the longitudes of an object, angle or
+        house in all charts.
+
+        """
+        if ID in self.index:
+            return self.lon[:, self.index[ID]]
+        elif ID in const.LIST_ANGLES:
+            return self.angles[:, const.LIST_ANGLES.index(ID)]
+        return self.houses[:, const.LIST_HOUSES.index(ID)]
+
+    def signIndex(self, ID=None):
+        """ Returns the sign indexes [0..11] of an object or
+        of all objects.
+
+        """
+        lon = self.lon if ID is None else self.getLon(ID)
+        return (lon // 30).astype(np.int64) % 12
+
+    def housesOf(self, lons):
+        """ Returns the house indexes [0..11] of an array
+        of longitudes with shape (charts,) or (charts, k),
+        as HouseList.getHouseByLon.
+
+        """
+        lons = np.asarray(lons)
+        column = lons.ndim == 1
+        lons = lons.reshape(len(self), -1)
+        sizes = np.mod(np.roll(self.houses, -1, axis=1) - self.houses, 360)
+        start = self.houses + House._OFFSET
+        dist = np.mod(lons[:, :, None] - start[:, None, :], 360)
+        res = np.argmax(dist < sizes[:, None, :], axis=2)
+        return res[:, 0] if column else res
+
+    def houseIndex(self, ID=None):
+        """ Returns the house indexes [0..11] of an object
+        or of all objects.
+
+        """
+        return self.housesOf(self.lon if ID is None else self.getLon(ID))
+
+    def isDiurnal(self):
+        """ Returns a boolean array with the diurnal charts. """
+        sun = self.index[const.SUN]
+        mc = self.angles[:, const.LIST_ANGLES.index(const.MC)]
+        sunRA, sunDecl = _eqCoords(self.lon[:, sun], self.lat[:, sun])
+        mcRA, _ = _eqCoords(mc, np.zeros(len(self)))
+
+        # Check if the sun is within its diurnal semi-arc
+        tan = np.tan(np.radians(sunDecl)) * np.tan(np.radians(self.geolat))
+        dArc = 180 + 2 * np.degrees(np.arcsin(np.clip(tan, -1, 1)))
+        dist = np.abs((sunRA - mcRA + 180) % 360 - 180)
+        return dist <= dArc / 2.0 + 0.0003
+
+    def moonPhase(self):
+        """ Returns an array with the moon phases. """
+        dist = np.mod(self.getLon(const.MOON) - self.getLon(const.SUN), 360)
+        return np.array(MOON_PHASES)[(dist // 90).astype(np.int64)]
+
+    def score(self, ID, lons=None):
+        """ Returns the essential dignity scores of an object
+        at its positions or at an array of longitudes.
+
+        """
+        lons = self.getLon(ID) if lons is None else lons
+        return essential.scoreArray(ID, lons)
+
+    def almutem(self, ID):
+        """ Returns the almutems of the positions of an 
+        object, angle or house.
+
+        """
+        return essential.almutemArray(self.getLon(ID))
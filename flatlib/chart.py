@@ -21,10 +21,14 @@
 """
 
 from . import angle
+from . import aspects
 from . import const
 from . import utils
 from .ephem import ephem
 from .datetime import Datetime
+from .geopos import GeoPos
+from .object import GenericObject, Object, House, FixedStar
+from .lists import GenericList, HouseList
 
 
 # ------------------ #
@@ -51,18 +55,21 @@ class Chart:
         self.date = date
         self.pos = pos
         self.hsys = hsys
+
+        # Objects, houses and angles are fetched together
+        objects, self.houses, self.angles = ephem.getChartData(
+            IDs, self.date, self.pos, self.hsys)
         self.objects = {}  # Dictionary to store both planets and fixed stars
-        for id in IDs:
-            self.objects[id] = ephem.getObject(id, self.date, self.pos)
+        for obj in objects:
+            self.objects[obj.id] = obj
 
         # Optionally include fixed stars
         if include_fixed_stars:
             fixed_star_IDs = kwargs.get('fixed_star_IDs', const.LIST_FIXED_STARS)
-            for id in fixed_star_IDs:
-                self.objects[id] = ephem.getFixedStar(id, self.date)
-
-        self.houses, self.angles = ephem.getHouses(self.date, self.pos, self.hsys)
+            for star in ephem.getFixedStarList(fixed_star_IDs, self.date):
+                self.objects[star.id] = star
 
+        self._aspectGrids = {}
 
     def copy(self):
         """ Returns a deep copy of this chart. """
@@ -70,9 +77,46 @@ class Chart:
         chart.date = self.date
         chart.pos = self.pos
         chart.hsys = self.hsys
-        chart.objects = self.objects.copy()
+        chart.objects = {ID: obj.copy() for (ID, obj) in self.objects.items()}
         chart.houses = self.houses.copy()
         chart.angles = self.angles.copy()
+        chart._aspectGrids = {}
+        return chart
+
+    # === Serialisation === #
+
+    def toDict(self):
+        """ Returns a compact representation of this chart
+        using only builtin types, so that it can cross
+        process boundaries cheaply. The date is stored as
+        (jd, utcoffset) and the position as (lat, lon).
+        
+        """
+        return {
+            'date': (self.date.jd, self.date.utcoffset.value),
+            'pos': (self.pos.lat, self.pos.lon),
+            'hsys': self.hsys,
+            'objects': [obj.toDict() for obj in self.objects.values()],
+            'houses': [house.toDict() for house in self.houses],
+            'angles': [angle.toDict() for angle in self.angles],
+        }
+
+    @classmethod
+    def fromDict(cls, _dict):
+        """ Builds a chart from its compact representation. """
+        chart = cls.__new__(cls)
+        chart.date = Datetime.fromJD(*_dict['date'])
+        chart.pos = GeoPos(*_dict['pos'])
+        chart.hsys = _dict['hsys']
+        chart.objects = {}
+        for obj in _dict['objects']:
+            objCls = FixedStar if obj['type'] == const.OBJ_FIXED_STAR else Object
+            chart.objects[obj['id']] = objCls.fromDict(obj)
+        chart.houses = HouseList([House.fromDict(house)
+                                  for house in _dict['houses']])
+        chart.angles = GenericList([GenericObject.fromDict(angle)
+                                    for angle in _dict['angles']])
+        chart._aspectGrids = {}
         return chart
 
     # === Properties === #
@@ -90,16 +134,15 @@ class Chart:
     
     def _attachHouseToObj(self, obj):
         """ Private method to attach a house to the object if it belongs to any. """
-        for house in self.houses:
-            if house.hasObject(obj):  # Assuming hasObject correctly determines if the object is within the house
-                obj.house = house  # Or house.id if you prefer storing just the ID
-                break
+        house = self.houses.getObjectHouse(obj)
+        if house:
+            obj.house = house
 
     def addFixedStars(self):
         """ Method to add fixed stars if they were not initially included. """
         fixed_star_IDs = const.LIST_FIXED_STARS
-        for ID in fixed_star_IDs:
-            self.objects[ID] = ephem.getFixedStar(ID, self.date)
+        for star in ephem.getFixedStarList(fixed_star_IDs, self.date):
+            self.objects[star.id] = star
     
     def getNextTransit():
         pass
@@ -139,6 +182,29 @@ class Chart:
         IDs = const.LIST_FIXED_STARS
         return ephem.getFixedStarList(IDs, self.date)
 
+    # === Aspects === #
+
+    def getAspectGrid(self, aspList=const.MAJOR_ASPECTS):
+        """ Returns the grid of aspects between all objects
+        and angles of this chart. Grids are cached and
+        recomputed when objects are added, replaced or
+        relocated.
+        
+        """
+        objs = list(self.objects.values()) + list(self.angles)
+        key = tuple(aspList)
+        signature = [(id(obj), obj.lon) for obj in objs]
+        cached = self._aspectGrids.get(key)
+        if cached is None or cached[0] != signature:
+            grid = aspects.AspectGrid(objs, aspList)
+            self._aspectGrids[key] = (signature, grid)
+            return grid
+        return cached[1]
+
+    def invalidateAspects(self):
+        """ Clears the cached aspect grids. """
+        self._aspectGrids = {}
+
     # === Houses and angles === #
 
     def isHouse1Asc(self):
@@ -263,6 +263,7 @@ class AccidentalDignity:
         
         """
         res = []
+        grid = self.chart.getAspectGrid(aspList)
 
         for otherID in IDs:
             # Ignore same 
@@ -270,8 +271,7 @@ class AccidentalDignity:
                 continue
 
             # Get aspects to the other object
-            otherObj = self.chart.getObject(otherID)
-            asp = aspects.getAspect(self.obj, otherObj, aspList)
+            asp = grid.getAspect(self.obj.id, otherID)
 
             if asp.type == const.NO_ASPECT:
                 continue
@@ -9,8 +9,15 @@
     information from the table and to compute scores and
     almutems.
 
+    Since term and face limits are whole degrees, the
+    dignities, scores and almutem of each degree of the 
+    zodiac are compiled once into lookup tables, which
+    are rebuilt when the terms or faces are changed.
+
 """
 
+import numpy as np
+
 from . import tables
 from flatlib import const
 
@@ -34,11 +41,12 @@ def setFaces(variant):
     Sets the default faces variant
 
     """
-    global FACES
+    global FACES, COMPILED
     if variant == CHALDEAN_FACES:
         FACES = tables.CHALDEAN_FACES
     else:
         FACES = tables.TRIPLICITY_FACES
+    COMPILED = None
 
 
 def setTerms(variant):
@@ -47,13 +55,14 @@ def setTerms(variant):
     table.
 
     """
-    global TERMS
+    global TERMS, COMPILED
     if variant == EGYPTIAN_TERMS:
         TERMS = tables.EGYPTIAN_TERMS
     elif variant == TETRABIBLOS_TERMS:
         TERMS = tables.TETRABIBLOS_TERMS
     elif variant == LILLY_TERMS:
         TERMS = tables.LILLY_TERMS
+    COMPILED = None
 
 
 # === Table properties === #
@@ -123,11 +132,18 @@ def face(sign, lon):
         return faces[2]
 
 
-# === Complex properties === #
+# === Compiled tables === #
 
-def getInfo(sign, lon):
-    """ Returns the complete essential dignities
-    for a sign and longitude.
+# Compiled tables for the current terms and faces
+COMPILED = None
+
+# Sign indexes
+SIGN_INDEX = {sign: i for (i, sign) in enumerate(const.LIST_SIGNS)}
+
+
+def _getInfo(sign, lon):
+    """ Returns the essential dignities for a sign and
+    longitude from the dignity tables.
 
     """
     return {
@@ -143,6 +159,80 @@ def getInfo(sign, lon):
     }
 
 
+def _infoScore(ID, info):
+    """ Returns the score of an object given the 
+    essential dignities of a point.
+
+    """
+    return sum([SCORES[dign] for (dign, objID) in info.items() if objID == ID])
+
+
+def _compile():
+    """ Returns the dignities, scores of the seven 
+    planets and almutem for each degree of the zodiac.
+    
+    """
+    info = [_getInfo(const.LIST_SIGNS[deg // 30], deg % 30)
+            for deg in range(360)]
+    scores = {ID: np.array([_infoScore(ID, rec) for rec in info])
+              for ID in const.LIST_SEVEN_PLANETS}
+    almutems = []
+    for deg in range(360):
+        res = [None, 0]
+        for ID in const.LIST_SEVEN_PLANETS:
+            if scores[ID][deg] > res[1]:
+                res = [ID, scores[ID][deg]]
+        almutems.append(res[0])
+    return {
+        'info': info,
+        'scores': scores,
+        'almutem': np.array(almutems, dtype=object)
+    }
+
+
+def compiledTable():
+    """ Returns the compiled tables for the current 
+    terms and faces.
+    
+    """
+    global COMPILED
+    if COMPILED is None:
+        COMPILED = _compile()
+    return COMPILED
+
+
+def _degree(sign, lon):
+    """ Returns the degree of the zodiac of a sign and 
+    longitude, or None if the longitude is not within
+    the sign.
+    
+    """
+    if 0 <= lon < 30:
+        return SIGN_INDEX[sign] * 30 + int(lon)
+    return None
+
+
+def _degrees(lons):
+    """ Returns the degrees of the zodiac of an array
+    of longitudes.
+    
+    """
+    return np.floor(np.mod(lons, 360)).astype(np.int64) % 360
+
+
+# === Complex properties === #
+
+def getInfo(sign, lon):
+    """ Returns the complete essential dignities
+    for a sign and longitude.
+
+    """
+    deg = _degree(sign, lon)
+    if deg is None:
+        return _getInfo(sign, lon)
+    return dict(compiledTable()['info'][deg])
+
+
 def isPeregrine(ID, sign, lon):
     """ Returns if an object is peregrine
     on a sign and longitude.
@@ -175,9 +265,11 @@ def score(ID, sign, lon):
     a sign and longitude.
 
     """
-    info = getInfo(sign, lon)
-    dignities = [dign for (dign, objID) in info.items() if objID == ID]
-    return sum([SCORES[dign] for dign in dignities])
+    deg = _degree(sign, lon)
+    table = compiledTable()
+    if deg is not None and ID in table['scores']:
+        return int(table['scores'][ID][deg])
+    return _infoScore(ID, getInfo(sign, lon))
 
 
 def almutem(sign, lon):
@@ -185,6 +277,10 @@ def almutem(sign, lon):
     sign and longitude.
 
     """
+    deg = _degree(sign, lon)
+    if deg is not None:
+        return compiledTable()['almutem'][deg]
+
     planets = const.LIST_SEVEN_PLANETS
     res = [None, 0]
     for ID in planets:
@@ -194,6 +290,29 @@ def almutem(sign, lon):
     return res[0]
 
 
+# === Array functions === #
+
+def scoreArray(ID, lons):
+    """ Returns the scores of an object for an array
+    of zodiac longitudes.
+    
+    """
+    degs = _degrees(lons)
+    table = compiledTable()
+    if ID in table['scores']:
+        return table['scores'][ID][degs]
+    scores = np.array([_infoScore(ID, rec) for rec in table['info']])
+    return scores[degs]
+
+
+def almutemArray(lons):
+    """ Returns the almutems for an array of zodiac
+    longitudes.
+    
+    """
+    return compiledTable()['almutem'][_degrees(lons)]
+
+
 # ----------------------- #
 #   EssentialInfo Class   #
 # ----------------------- #
@@ -13,6 +13,7 @@
 
 import flatlib
 from . import swe
+from . import tools
 
 # Set default swefile path
 swe.setPath(flatlib.PATH_RES + 'swefiles')
@@ -21,3 +22,43 @@ swe.setPath(flatlib.PATH_RES + 'swefiles')
 # Configure swefile path
 def setPath(path):
     swe.setPath(path)
+
+
+# Configure cache of raw ephemeris calls
+def setCache(maxsize):
+    swe.setCache(maxsize)
+
+
+# Configure interpolation tables
+def setTables(tables):
+    swe.setTables(tables)
+
+
+# Configure interpolation tables from an ephemeris file
+def setTablesFile(path):
+    # Imported here so that the ephfile module can be
+    # run from the command line
+    from . import ephfile
+    swe.setTables(ephfile.load(path))
+
+
+# Configure the index of lunations
+def setLunations(index):
+    tools.setLunations(index)
+
+
+# Configure the index of lunations from a file
+def setLunationsFile(path):
+    from . import lunations
+    tools.setLunations(lunations.LunationIndex.load(path))
+
+
+# Configure an eclipse catalogue
+def setEclipses(catalogue):
+    swe.setEclipses(catalogue)
+
+
+# Configure an eclipse catalogue from a file
+def setEclipsesFile(path):
+    from . import eclipses
+    swe.setEclipses(eclipses.EclipseCatalogue.load(path))
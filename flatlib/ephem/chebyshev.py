@@ -0,0 +1,280 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements an ephemeris backend based
+    on precomputed Chebyshev tables.
+
+    For each object, the date range is split in segments
+    (see SEGMENT_DAYS) and the longitude, latitude and
+    distance are fitted by Chebyshev series of degree
+    DEGREE, sampled from the Swiss Ephemeris at Chebyshev
+    nodes. Speeds are given by the derivatives of the
+    series.
+
+    Each segment is checked against the Swiss Ephemeris
+    between its nodes and split in halves while the error
+    is above TOLERANCE. This is needed near conjunctions
+    with the Sun, where the light deflection makes the
+    positions of the outer planets change abruptly.
+    
+    The resulting interpolation error is in the order of
+    TOLERANCE (0.01 arc-seconds), well under MAX_ERROR in
+    tools.py (one arc-second). The error of a table can be measured 
+    with ChebyshevTable.maxError().
+
+    A table is selected as the source of object positions
+    with swe.setTables(), so that eph.getObject and other
+    callers remain unchanged. Dates and objects outside
+    the table are computed by the Swiss Ephemeris.
+
+"""
+
+import math
+
+import numpy as np
+import swisseph
+from numpy.polynomial import chebyshev
+
+from . import swe
+from flatlib import const
+
+# Degree of the Chebyshev series
+DEGREE = 12
+
+# Maximum error in degrees (0.01 arc-seconds)
+TOLERANCE = 0.01 / 3600
+
+# Minimum segment length in days
+MIN_SEGMENT_DAYS = 1 / 16
+
+# Initial segment length in days for each object
+SEGMENT_DAYS = {
+    const.SUN: 16,
+    const.MOON: 4,
+    const.MERCURY: 8,
+    const.VENUS: 16,
+    const.MARS: 16,
+    const.JUPITER: 32,
+    const.SATURN: 32,
+    const.URANUS: 32,
+    const.NEPTUNE: 32,
+    const.PLUTO: 32,
+    const.CHIRON: 32,
+    const.NORTH_NODE: 32,
+}
+
+
+# === Private functions === #
+
+def _nodes(degree):
+    """ Returns the Chebyshev nodes in [-1, 1] in
+    increasing order.
+
+    """
+    n = degree + 1
+    k = np.arange(n)[::-1]
+    return np.cos(math.pi * (k + 0.5) / n)
+
+
+def _sweCalc(ID, jd):
+    """ Returns the raw positions from the Swiss Ephemeris,
+    ignoring any tables.
+
+    """
+    return swisseph.calc_ut(jd, swe.SWE_OBJECTS[ID], swe.SWE_FLAGS)[0]
+
+
+def _sample(ID, jd0, days, x):
+    """ Returns the longitude, latitude and distance of
+    an object at normalized times x of a segment. 
+    
+    """
+    jds = jd0 + (x + 1) * days / 2.0
+    values = np.array([_sweCalc(ID, jd)[:3] for jd in jds])
+
+    # Unwrap longitudes so that the series is continuous
+    values[:, 0] = np.rad2deg(np.unwrap(np.deg2rad(values[:, 0])))
+    return values
+
+
+def _fitSegment(ID, jd0, days, degree):
+    """ Returns the (3, degree + 1) coefficients of the
+    longitude, latitude and distance of an object in
+    a segment starting at jd0, and the maximum error
+    between the nodes.
+
+    """
+    x = _nodes(degree)
+    values = _sample(ID, jd0, days, x)
+    coeffs = chebyshev.chebfit(x, values, degree).T
+
+    # Check errors at the midpoints between nodes
+    xm = (x[1:] + x[:-1]) / 2.0
+    check = _sample(ID, jd0, days, xm)
+    fitted = chebyshev.chebval(xm, coeffs.T).T
+    dlon = (fitted[:, 0] - check[:, 0] + 180) % 360 - 180
+    dlat = fitted[:, 1] - check[:, 1]
+    error = max(np.max(np.abs(dlon)), np.max(np.abs(dlat)))
+    return coeffs, error
+
+
+def _fitRange(ID, jd0, days, degree):
+    """ Returns the list of (jd0, coeffs) segments fitting
+    an object in a range, splitting segments while the
+    error is above TOLERANCE.
+
+    """
+    coeffs, error = _fitSegment(ID, jd0, days, degree)
+    if error <= TOLERANCE or days <= MIN_SEGMENT_DAYS:
+        return [(jd0, coeffs)]
+    half = days / 2.0
+    return (_fitRange(ID, jd0, half, degree) +
+            _fitRange(ID, jd0 + half, half, degree))
+
+
+def _clenshaw(coeffs, x):
+    """ Evaluates Chebyshev series with coefficients of
+    shape (n, m, k) at n points, returning (n, m) values.
+
+    """
+    x2 = 2.0 * x[:, None]
+    b1 = np.zeros(coeffs.shape[:2])
+    b2 = np.zeros(coeffs.shape[:2])
+    for k in range(coeffs.shape[2] - 1, 0, -1):
+        b1, b2 = coeffs[:, :, k] + x2 * b1 - b2, b1
+    return coeffs[:, :, 0] + x[:, None] * b1 - b2
+
+
+# ------------------------ #
+#   ChebyshevTable Class   #
+# ------------------------ #
+
+class ChebyshevTable:
+    """ This class represents a set of Chebyshev tables,
+    one for each object, over a range of julian dates.
+
+    """
+
+    def __init__(self, start, end, coeffs, bounds):
+        self.start = start
+        self.end = end
+        self.coeffs = coeffs  # ID => array (nseg, 3, degree + 1)
+        self.bounds = bounds  # ID => array (nseg + 1) of segment limits
+
+    @classmethod
+    def build(cls, IDs, start, end, degree=DEGREE):
+        """ Builds tables for a list of objects between
+        two julian dates.
+
+        """
+        coeffs = {}
+        bounds = {}
+        for ID in IDs:
+            days = SEGMENT_DAYS[ID]
+            nseg = int(math.ceil((end - start) / days))
+            segments = []
+            for i in range(nseg):
+                segments += _fitRange(ID, start + i * days, days, degree)
+            coeffs[ID] = np.array([seg[1] for seg in segments])
+            bounds[ID] = np.array([seg[0] for seg in segments] +
+                                  [start + nseg * days])
+        return cls(start, end, coeffs, bounds)
+
+    # === Persistence === #
+
+    def save(self, path):
+        """ Saves this table to a numpy .npz file. """
+        IDs = list(self.coeffs.keys())
+        arrays = {'coeffs_%s' % i: self.coeffs[ID] for i, ID in enumerate(IDs)}
+        arrays.update({'bounds_%s' % i: self.bounds[ID] for i, ID in enumerate(IDs)})
+        np.savez(path,
+                 ids=np.array(IDs),
+                 range=np.array([self.start, self.end]),
+                 **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a table from a numpy .npz file. """
+        with np.load(path) as data:
+            IDs = [str(ID) for ID in data['ids']]
+            start, end = data['range'].tolist()
+            coeffs = {ID: data['coeffs_%s' % i] for i, ID in enumerate(IDs)}
+            bounds = {ID: data['bounds_%s' % i] for i, ID in enumerate(IDs)}
+        return cls(start, end, coeffs, bounds)
+
+    # === Queries === #
+
+    def covers(self, ID, jd):
+        """ Returns if this table has an object at a
+        julian date.
+
+        """
+        return ID in self.coeffs and self.start <= jd < self.end
+
+    def _locate(self, ID, jds):
+        """ Returns the segment indexes, the normalized
+        times in [-1, 1] and the segment lengths of an 
+        array of julian dates.
+
+        """
+        bounds = self.bounds[ID]
+        jds = np.asarray(jds, dtype=np.float64)
+        idx = np.searchsorted(bounds, jds, side='right') - 1
+        idx = np.clip(idx, 0, len(bounds) - 2)
+        days = bounds[idx + 1] - bounds[idx]
+        x = 2.0 * (jds - bounds[idx]) / days - 1.0
+        return idx, x, days
+
+    def calc(self, ID, jd):
+        """ Returns the positions of an object in the same
+        format of swisseph.calc_ut: (lon, lat, dist, lonspeed,
+        latspeed, distspeed).
+
+        """
+        idx, x, days = self._locate(ID, jd)
+        coeffs = self.coeffs[ID][idx]
+        values = chebyshev.chebval(x, coeffs.T)
+        speeds = chebyshev.chebval(x, chebyshev.chebder(coeffs.T))
+        speeds *= 2.0 / days
+        return (float(values[0] % 360), float(values[1]), float(values[2]),
+                float(speeds[0]), float(speeds[1]), float(speeds[2]))
+
+    def positions(self, ID, jds):
+        """ Returns a structured array (see swe.OBJECT_DTYPE)
+        with the positions of an object for an array of
+        julian dates.
+
+        """
+        idx, x, days = self._locate(ID, jds)
+        coeffs = self.coeffs[ID][idx]  # (n, 3, degree + 1)
+        dcoeffs = chebyshev.chebder(coeffs, axis=2)
+
+        # Evaluate all series with the Clenshaw recurrence
+        values = _clenshaw(coeffs, x)
+        speeds = _clenshaw(dcoeffs, x) * (2.0 / days)[:, None]
+
+        res = np.empty(len(x), dtype=swe.OBJECT_DTYPE)
+        res['lon'] = np.mod(values[:, 0], 360)
+        res['lat'] = values[:, 1]
+        res['lonspeed'] = speeds[:, 0]
+        res['latspeed'] = speeds[:, 1]
+        return res
+
+    def maxError(self, ID, samples=1000):
+        """ Returns the maximum longitude and latitude
+        error in arc-seconds, measured against the Swiss
+        Ephemeris at random dates.
+
+        """
+        rng = np.random.default_rng(0)
+        jds = rng.uniform(self.start, self.end, samples)
+        pos = self.positions(ID, jds)
+        error = 0.0
+        for i, jd in enumerate(jds.tolist()):
+            sweList = _sweCalc(ID, jd)
+            dlon = (pos['lon'][i] - sweList[0] + 180) % 360 - 180
+            dlat = pos['lat'][i] - sweList[1]
+            error = max(error, abs(dlon), abs(dlat))
+        return error * 3600
@@ -0,0 +1,178 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements catalogues of global solar
+    and lunar eclipses over a range of julian dates.
+
+    A catalogue keeps all the details returned by the
+    Swiss Ephemeris (see swe.eclipseGlobal) in arrays, so
+    that the previous, next and all eclipses between two
+    dates are found by binary search over the times of
+    maximum eclipse.
+
+    A catalogue is selected with swe.setEclipses(), so
+    that the eclipse functions of the ephem module remain
+    unchanged. Dates outside the catalogue are computed
+    by the Swiss Ephemeris.
+
+    Catalogue files can be generated from the command
+    line with:
+
+        python -m flatlib.ephem.eclipses solar.npz Solar 1900/01/01 2100/01/01
+
+"""
+
+import argparse
+
+import numpy as np
+
+from . import swe
+from flatlib.datetime import Datetime
+
+
+# === Private functions === #
+
+def _search(kind, start, end):
+    """ Returns the list of eclipses of a kind between
+    two julian dates from the Swiss Ephemeris.
+
+    """
+    res = []
+    eclipse = swe.eclipseGlobal(kind, start, False)
+    while eclipse['maximum'] < end:
+        res.append(eclipse)
+        eclipse = swe.eclipseGlobal(kind, eclipse['maximum'], False)
+    return res
+
+
+# ------------------------- #
+#   EclipseCatalogue Class  #
+# ------------------------- #
+
+class EclipseCatalogue:
+    """ This class represents the list of global eclipses
+    of a kind between two julian dates.
+
+    """
+
+    def __init__(self, kind, start, end, fields):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.fields = fields  # Field => array of julian dates
+        self.maximum = fields['maximum']
+
+    @classmethod
+    def build(cls, kind, start, end):
+        """ Builds the catalogue of eclipses of a kind
+        between two julian dates.
+
+        """
+        eclipses = _search(kind, start, end)
+        keys = swe.eclipseGlobal(kind, start, False).keys()
+        fields = {key: np.array([eclipse[key] for eclipse in eclipses],
+                                dtype=np.float64) for key in keys}
+        return cls(kind, start, end, fields)
+
+    # === Persistence === #
+
+    def save(self, path):
+        """ Saves this catalogue to a numpy .npz file. """
+        np.savez(path,
+                 kind=np.array(self.kind),
+                 range=np.array([self.start, self.end]),
+                 **self.fields)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a catalogue from a numpy .npz file. """
+        with np.load(path) as data:
+            kind = str(data['kind'])
+            start, end = data['range'].tolist()
+            fields = {key: data[key] for key in data.files
+                      if key not in ['kind', 'range']}
+        return cls(kind, start, end, fields)
+
+    # === Queries === #
+
+    def __len__(self):
+        return len(self.maximum)
+
+    def get(self, i):
+        """ Returns the details of an eclipse. """
+        return {key: float(values[i]) for (key, values) in self.fields.items()}
+
+    def prev(self, jd):
+        """ Returns the eclipse before a julian date, or
+        None if it is not in the catalogue.
+
+        """
+        i = int(np.searchsorted(self.maximum, jd, side='left')) - 1
+        if i < 0 or jd > self.end:
+            return None
+        return self.get(i)
+
+    def next(self, jd):
+        """ Returns the eclipse after a julian date, or
+        None if it is not in the catalogue.
+
+        """
+        i = int(np.searchsorted(self.maximum, jd, side='right'))
+        if i >= len(self) or jd < self.start:
+            return None
+        return self.get(i)
+
+    def covers(self, start, end):
+        """ Returns if this catalogue has all eclipses
+        between two julian dates.
+
+        """
+        return self.start <= start and end <= self.end
+
+    def between(self, start, end):
+        """ Returns the list of eclipses with the maximum
+        between two julian dates.
+
+        """
+        i = np.searchsorted(self.maximum, start, side='left')
+        j = np.searchsorted(self.maximum, end, side='left')
+        return [self.get(k) for k in range(i, j)]
+
+
+# === Public functions === #
+
+def eclipsesBetween(kind, start, end):
+    """ Returns the list of eclipses of a kind between
+    two julian dates, using the selected catalogue if it
+    covers the dates.
+
+    """
+    catalogue = swe.ECLIPSES.get(kind)
+    if catalogue is not None and catalogue.covers(start, end):
+        return catalogue.between(start, end)
+    return _search(kind, start, end)
+
+
+# === Command line === #
+
+def main(args=None):
+    """ Generates an eclipse catalogue for a date range. """
+    parser = argparse.ArgumentParser(
+        prog='python -m flatlib.ephem.eclipses',
+        description='Generates a catalogue of global eclipses.')
+    parser.add_argument('path', help='output file (.npz)')
+    parser.add_argument('kind', choices=[swe.SOLAR_ECLIPSE, swe.LUNAR_ECLIPSE],
+                        help='eclipse kind')
+    parser.add_argument('start', help='start date (yyyy/mm/dd)')
+    parser.add_argument('end', help='end date (yyyy/mm/dd)')
+    args = parser.parse_args(args)
+
+    start = Datetime(args.start).jd
+    end = Datetime(args.end).jd
+    EclipseCatalogue.build(args.kind, start, end).save(args.path)
+
+
+if __name__ == '__main__':
+    main()
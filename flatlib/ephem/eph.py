@@ -12,11 +12,13 @@
   
 """
 
+import numpy as np
+
+from . import events
 from . import swe
 from . import tools
 from flatlib import angle
 from flatlib import const
-from flatlib import utils
 from flatlib.geopos import GeoPos
 
 
@@ -24,9 +26,13 @@ from flatlib.geopos import GeoPos
 
 def getObject(ID, jd, lat, lon):
     """ Returns an object for a specific date and 
-    location.
+    location. If 'jd' is a sequence of julian dates,
+    returns a structured array as getObjectArrays.
     
     """
+    if np.ndim(jd) > 0:
+        return getObjectArrays([ID], jd, lat, lon)[ID]
+
     if ID == const.SOUTH_NODE:
         obj = swe.sweObject(const.NORTH_NODE, jd)
         obj.update({
@@ -53,6 +59,90 @@ def getObject(ID, jd, lat, lon):
     return obj
 
 
+def getChartData(IDs, jd, lat, lon, hsys):
+    """ Returns the objects, houses and angles of a
+    chart. Each object is fetched from the ephemeris
+    once, and the Pars Fortuna, South Node and Syzygy
+    are derived from the fetched positions.
+    
+    """
+    houses, angles = swe.sweHouses(jd, lat, lon, hsys)
+    fetched = {}
+
+    def fetch(ID):
+        if ID not in fetched:
+            fetched[ID] = swe.sweObject(ID, jd)
+        return dict(fetched[ID])
+
+    objects = []
+    for ID in IDs:
+        if ID == const.SOUTH_NODE:
+            obj = fetch(const.NORTH_NODE)
+            obj.update({
+                'id': const.SOUTH_NODE,
+                'lon': angle.norm(obj['lon'] + 180),
+            })
+        elif ID == const.PARS_FORTUNA:
+            sun = fetch(const.SUN)
+            moon = fetch(const.MOON)
+            asc, mc = angles[0]['lon'], angles[1]['lon']
+            diurnal = tools.isSunAbove(sun['lon'], sun['lat'], mc, lat)
+            obj = {
+                'id': ID,
+                'lon': tools.pfLonFrom(sun['lon'], moon['lon'], asc, diurnal),
+                'lat': 0,
+                'lonspeed': 0,
+                'latspeed': 0
+            }
+        elif ID == const.SYZYGY:
+            szjd = tools.syzygyJD(jd, fetch(const.SUN), fetch(const.MOON))
+            obj = swe.sweObject(const.MOON, szjd)
+            obj['id'] = const.SYZYGY
+        else:
+            obj = fetch(ID)
+        _signInfo(obj)
+        objects.append(obj)
+
+    for obj in houses + angles:
+        _signInfo(obj)
+    return (objects, houses, angles)
+
+
+def getObjectArrays(IDs, jds, lat, lon):
+    """ Returns the positions of a list of objects for
+    many julian dates and a location. 
+    
+    The result is a dict mapping each ID to a structured 
+    array (see swe.OBJECT_DTYPE) with one record per date.
+    
+    """
+    jds = np.asarray(jds, dtype=np.float64).ravel()
+
+    # Fetch every Swiss Ephemeris object in a single batch
+    sweIDs = [ID for ID in IDs if ID in swe.SWE_OBJECTS]
+    if const.SOUTH_NODE in IDs and const.NORTH_NODE not in sweIDs:
+        sweIDs.append(const.NORTH_NODE)
+    batch = swe.sweObjectsBatch(sweIDs, jds)
+
+    res = {}
+    for ID in IDs:
+        if ID in batch:
+            res[ID] = batch[ID]
+        elif ID == const.SOUTH_NODE:
+            arr = batch[const.NORTH_NODE].copy()
+            arr['lon'] = np.mod(arr['lon'] + 180, 360)
+            res[ID] = arr
+        else:
+            # Derived objects are computed date by date
+            arr = np.zeros(len(jds), dtype=swe.OBJECT_DTYPE)
+            for i, jd in enumerate(jds.tolist()):
+                obj = getObject(ID, jd, lat, lon)
+                arr[i] = (obj['lon'], obj['lat'],
+                          obj['lonspeed'], obj['latspeed'])
+            res[ID] = arr
+    return res
+
+
 # === Houses === #
 
 def getHouses(jd, lat, lon, hsys):
@@ -74,6 +164,14 @@ def getFixedStar(ID, jd):
     return star
 
 
+def getFixedStars(IDs, jd):
+    """ Returns a list of fixed stars for a date. """
+    stars = swe.sweFixedStars(IDs, jd)
+    for star in stars:
+        _signInfo(star)
+    return stars
+
+
 # === Solar returns === #
 
 def nextSolarReturn(jd, lon):
@@ -86,6 +184,14 @@ def prevSolarReturn(jd, lon):
     return tools.solarReturnJD(jd, lon, False)
 
 
+def returnsBetween(ID, lon, jd, end):
+    """ Yields the jd of every return of an object to
+    a longitude between two jds.
+    
+    """
+    return events.returns(ID, lon, jd, end)
+
+
 # === Sunrise and sunsets === #
 
 def nextSunrise(jd, lat, lon):
@@ -108,13 +214,35 @@ def lastSunset(jd, lat, lon):
     return nextSunset(jd - 1.0, lat, lon)
 
 
+def sunriseSunsets(jd, end, lat, lon):
+    """ Returns the list of alternating sunrises and
+    sunsets from the last sunrise before 'jd' to the 
+    first sunrise after 'end'. Each event is searched
+    from the previous one.
+    
+    """
+    res = [lastSunrise(jd, lat, lon)]
+    while res[-1] <= end:
+        sunset = nextSunset(res[-1], lat, lon)
+        res += [sunset, nextSunrise(sunset, lat, lon)]
+    return res
+
+
 # === Stations === #
 
 def nextStation(ID, jd):
-    """ Returns the aproximate jd of the next station. """
+    """ Returns the jd of the next station. """
     return tools.nextStationJD(ID, jd)
 
 
+def stationsBetween(ID, jd, end):
+    """ Yields the jd of every station of an object
+    between two jds.
+    
+    """
+    return tools.stationsBetween(ID, jd, end)
+
+
 # === Other functions === #
 
 def _signInfo(obj):
@@ -122,6 +250,5 @@ def _signInfo(obj):
     lon = obj['lon']
     obj.update({
         'sign': const.LIST_SIGNS[int(lon / 30)],
-        'signlon': lon % 30,
-        'dms': utils.decimal_to_dms(lon)
+        'signlon': lon % 30
     })
@@ -14,6 +14,7 @@
 """
 
 from . import eph
+from . import eclipses
 from . import swe
 
 from flatlib.datetime import Datetime
@@ -26,17 +27,54 @@ from flatlib.lists import (GenericList, ObjectList,
 # === Objects === #
 
 def getObject(ID, date, pos):
-    """ Returns an ephemeris object. """
+    """ Returns an ephemeris object. If 'date' is a 
+    list of dates, returns a structured array with the
+    object positions for every date.
+    
+    """
+    if isinstance(date, (list, tuple)):
+        return getObjectArrays([ID], date, pos)[ID]
     obj = eph.getObject(ID, date.jd, pos.lat, pos.lon)
     return Object.fromDict(obj)
 
 
 def getObjectList(IDs, date, pos):
-    """ Returns a list of objects. """
+    """ Returns a list of objects. If 'date' is a list
+    of dates, returns a dict of structured arrays as
+    getObjectArrays.
+    
+    """
+    if isinstance(date, (list, tuple)):
+        return getObjectArrays(IDs, date, pos)
     objList = [getObject(ID, date, pos) for ID in IDs]
     return ObjectList(objList)
 
 
+def getObjectArrays(IDs, dates, pos):
+    """ Returns a dict mapping each object ID to a
+    structured array with fields lon, lat, lonspeed 
+    and latspeed, with one record per date.
+    
+    """
+    jds = [date.jd for date in dates]
+    return eph.getObjectArrays(IDs, jds, pos.lat, pos.lon)
+
+
+# === Charts === #
+
+def getChartData(IDs, date, pos, hsys):
+    """ Returns the list of objects and the lists of
+    houses and angles of a chart.
+    
+    """
+    objects, houses, angles = eph.getChartData(IDs, date.jd, pos.lat,
+                                               pos.lon, hsys)
+    oList = [Object.fromDict(obj) for obj in objects]
+    hList = [House.fromDict(house) for house in houses]
+    aList = [GenericObject.fromDict(angle) for angle in angles]
+    return (ObjectList(oList), HouseList(hList), GenericList(aList))
+
+
 # === Houses and angles === #
 
 def getHouses(date, pos, hsys):
@@ -73,7 +111,8 @@ def getFixedStar(ID, date):
 
 def getFixedStarList(IDs, date):
     """ Returns a list of fixed stars. """
-    starList = [getFixedStar(ID, date) for ID in IDs]
+    stars = eph.getFixedStars(IDs, date.jd)
+    starList = [FixedStar.fromDict(star) for star in stars]
     return FixedStarList(starList)
 
 
@@ -91,6 +130,15 @@ def prevSolarReturn(date, lon):
     return Datetime.fromJD(jd, date.utcoffset)
 
 
+def returnsBetween(ID, lon, start, end):
+    """ Yields the dates of every return of an object
+    to longitude 'lon' between two dates.
+    
+    """
+    for jd in eph.returnsBetween(ID, lon, start.jd, end.jd):
+        yield Datetime.fromJD(jd, start.utcoffset)
+
+
 # === Sunrise and sunsets === #
 
 def nextSunrise(date, pos):
@@ -117,14 +165,33 @@ def lastSunset(date, pos):
     return Datetime.fromJD(jd, date.utcoffset)
 
 
+def sunriseSunsets(start, end, pos):
+    """ Returns the list of dates of alternating sunrises
+    and sunsets from the last sunrise before 'start' to
+    the first sunrise after 'end'.
+    
+    """
+    jds = eph.sunriseSunsets(start.jd, end.jd, pos.lat, pos.lon)
+    return [Datetime.fromJD(jd, start.utcoffset) for jd in jds]
+
+
 # === Station === #
 
 def nextStation(ID, date):
-    """ Returns the aproximate date of the next station. """
+    """ Returns the date of the next station. """
     jd = eph.nextStation(ID, date.jd)
     return Datetime.fromJD(jd, date.utcoffset)
 
 
+def stationsBetween(ID, start, end):
+    """ Yields the dates of every station of an object
+    between two dates.
+    
+    """
+    for jd in eph.stationsBetween(ID, start.jd, end.jd):
+        yield Datetime.fromJD(jd, start.utcoffset)
+
+
 # === Eclipses === #
 
 def prevSolarEclipse(date):
@@ -165,3 +232,23 @@ def nextLunarEclipse(date):
 
     eclipse = swe.lunarEclipseGlobal(date.jd, backward=False)
     return Datetime.fromJD(eclipse['maximum'], date.utcoffset)
+
+
+def solarEclipsesBetween(start, end):
+    """ Returns the list of Datetimes of the maximum phase
+    of the global solar eclipses between two dates.
+
+    """
+    res = eclipses.eclipsesBetween(swe.SOLAR_ECLIPSE, start.jd, end.jd)
+    return [Datetime.fromJD(eclipse['maximum'], start.utcoffset)
+            for eclipse in res]
+
+
+def lunarEclipsesBetween(start, end):
+    """ Returns the list of Datetimes of the maximum phase
+    of the global lunar eclipses between two dates.
+
+    """
+    res = eclipses.eclipsesBetween(swe.LUNAR_ECLIPSE, start.jd, end.jd)
+    return [Datetime.fromJD(eclipse['maximum'], start.utcoffset)
+            for eclipse in res]
@@ -0,0 +1,129 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements a binary file format for the
+    Chebyshev tables (see chebyshev.py), designed to be
+    memory-mapped read-only. Processes loading the same
+    file share a single page-cached copy and the arrays
+    are used in place, without deserialisation.
+
+    The file is made of little-endian values:
+
+    - Header: magic (8 bytes), version (uint32), number
+      of objects (uint32), degree (uint32), reserved
+      (uint32), start jd (float64) and end jd (float64).
+    - Directory: for each object, the swe object number
+      (int32), number of segments (uint32), offset of the
+      segment bounds (uint64) and offset of the segment
+      coefficients (uint64).
+    - Data: for each object, (nseg + 1) float64 segment
+      bounds and (nseg, 3, degree + 1) float64 Chebyshev
+      coefficients.
+
+    Files can be generated from the command line with:
+
+        python -m flatlib.ephem.ephfile output.eph 2000/01/01 2030/01/01
+
+"""
+
+import argparse
+import mmap
+import struct
+
+import numpy as np
+
+from . import swe
+from .chebyshev import ChebyshevTable, SEGMENT_DAYS
+from flatlib.datetime import Datetime
+
+# File signature and version
+MAGIC = b'FLEPHEM\x00'
+VERSION = 1
+
+# Header and directory entry layouts
+HEADER = struct.Struct('<8sIIIIdd')
+ENTRY = struct.Struct('<iIQQ')
+
+
+# === Writing === #
+
+def write(table, path):
+    """ Writes a Chebyshev table to a file. """
+    IDs = list(table.coeffs.keys())
+    degree = table.coeffs[IDs[0]].shape[2] - 1
+
+    # Compute the offsets of each object data
+    offset = HEADER.size + ENTRY.size * len(IDs)
+    entries = []
+    for ID in IDs:
+        nseg = len(table.coeffs[ID])
+        boundsOffset = offset
+        coeffsOffset = boundsOffset + (nseg + 1) * 8
+        offset = coeffsOffset + nseg * 3 * (degree + 1) * 8
+        entries.append((swe.SWE_OBJECTS[ID], nseg, boundsOffset, coeffsOffset))
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(IDs), degree, 0,
+                            table.start, table.end))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+        for ID in IDs:
+            f.write(np.ascontiguousarray(table.bounds[ID], '<f8').tobytes())
+            f.write(np.ascontiguousarray(table.coeffs[ID], '<f8').tobytes())
+
+
+# === Reading === #
+
+def load(path):
+    """ Returns a Chebyshev table whose arrays are backed
+    by a read-only memory map of a file.
+
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, nobj, degree, _, start, end = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Invalid ephemeris file: %s' % path)
+
+    # Map swe object numbers to flatlib IDs
+    sweIDs = {num: ID for (ID, num) in swe.SWE_OBJECTS.items()}
+
+    coeffs = {}
+    bounds = {}
+    for i in range(nobj):
+        num, nseg, boundsOffset, coeffsOffset = ENTRY.unpack_from(
+            buffer, HEADER.size + i * ENTRY.size)
+        ID = sweIDs[num]
+        bounds[ID] = np.frombuffer(buffer, '<f8', nseg + 1, boundsOffset)
+        coeffs[ID] = np.frombuffer(buffer, '<f8', nseg * 3 * (degree + 1),
+                                   coeffsOffset).reshape(nseg, 3, degree + 1)
+    return ChebyshevTable(start, end, coeffs, bounds)
+
+
+# === Command line === #
+
+def main(args=None):
+    """ Generates an ephemeris file for a date range. """
+    parser = argparse.ArgumentParser(
+        prog='python -m flatlib.ephem.ephfile',
+        description='Generates a memory-mappable ephemeris file.')
+    parser.add_argument('path', help='output file')
+    parser.add_argument('start', help='start date (yyyy/mm/dd)')
+    parser.add_argument('end', help='end date (yyyy/mm/dd)')
+    parser.add_argument('--objects', nargs='+', metavar='ID',
+                        default=list(SEGMENT_DAYS.keys()),
+                        choices=list(swe.SWE_OBJECTS.keys()),
+                        help='objects to include (default: all)')
+    args = parser.parse_args(args)
+
+    start = Datetime(args.start).jd
+    end = Datetime(args.end).jd
+    table = ChebyshevTable.build(args.objects, start, end)
+    write(table, args.path)
+
+
+if __name__ == '__main__':
+    main()
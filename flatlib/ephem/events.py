@@ -0,0 +1,179 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements a generic solver for events
+    given by longitude crossings, such as ingresses,
+    returns and exact aspects between two objects.
+
+    An event is a root of the angular distance between
+    an object (or a pair of objects) and a target. The
+    search steps forward in time using the maximum speed
+    of the objects: if the distance to the target is d
+    and the objects cannot move faster than v, no root
+    can happen in the next d / v days. Roots are then
+    refined with the Brent method.
+
+    Roots closer than MIN_STEP from each other may be
+    missed, which only happens when the distance barely
+    touches the target (near stations).
+
+"""
+
+import heapq
+
+from . import swe
+from . import tools
+from flatlib import angle
+from flatlib import const
+
+# Maximum absolute longitude speeds (degrees per day),
+# including a safety margin
+MAX_SPEED = {
+    const.SUN: 1.1,
+    const.MOON: 15.5,
+    const.MERCURY: 2.3,
+    const.VENUS: 1.3,
+    const.MARS: 0.9,
+    const.JUPITER: 0.3,
+    const.SATURN: 0.15,
+    const.URANUS: 0.08,
+    const.NEPTUNE: 0.05,
+    const.PLUTO: 0.05,
+    const.CHIRON: 0.2,
+    const.NORTH_NODE: 0.1,
+    const.SOUTH_NODE: 0.1,
+}
+MAX_SPEED_DEFAULT = 15.5
+
+# Minimum search step in days
+MIN_STEP = 0.1
+
+# Mean return periods in days of objects which are 
+# never retrograde
+RETURN_PERIOD = {
+    const.SUN: 365.2422,
+    const.MOON: 27.3216,
+}
+
+
+# === Generic solver === #
+
+def findRoots(func, speed, start, end, period=360):
+    """ Yields the julian dates between 'start' and 'end'
+    where 'func' crosses zero. The function must return
+    angular distances in [-period/2, period/2) changing
+    at most 'speed' degrees per day.
+
+    """
+    a, fa = start, func(start)
+    while a < end:
+        b = min(a + max(abs(fa) / speed, MIN_STEP), end)
+        fb = func(b)
+        # A sign change is a root only if it is not the
+        # jump between -period/2 and period/2
+        if fa * fb <= 0 and fa != 0 and abs(fa - fb) < period / 2:
+            yield tools.brent(func, a, b, fa, fb)
+        a, fa = b, fb
+
+
+def objectLon(ID, jd):
+    """ Returns the longitude of an object which does 
+    not depend on the location: any Swiss Ephemeris 
+    object or the South Node.
+
+    """
+    if ID == const.SOUTH_NODE:
+        return angle.norm(swe.sweObjectLon(const.NORTH_NODE, jd) + 180)
+    elif ID not in swe.SWE_OBJECTS:
+        raise ValueError('No events for object %s' % ID)
+    return swe.sweObjectLon(ID, jd)
+
+
+def _speed(*IDs):
+    """ Returns the maximum relative speed of objects. """
+    return sum(MAX_SPEED.get(ID, MAX_SPEED_DEFAULT) for ID in IDs)
+
+
+# === Events === #
+
+def crossings(ID, lon, start, end):
+    """ Yields the julian dates when an object crosses
+    a longitude.
+
+    """
+    func = lambda jd: angle.closestdistance(lon, objectLon(ID, jd))
+    return findRoots(func, _speed(ID), start, end)
+
+
+def _refine(ID, lon, jd):
+    """ Refines the julian date when an object is at a
+    longitude using its speed (Newton method).
+
+    """
+    for i in range(20):
+        obj = swe.sweObject(ID, jd)
+        delta = angle.closestdistance(obj['lon'], lon) / obj['lonspeed']
+        jd += delta
+        if abs(delta) < tools.MAX_TIME_ERROR:
+            break
+    return jd
+
+
+def returns(ID, lon, start, end):
+    """ Yields the julian dates when an object returns
+    to a longitude, which are its crossings. 
+    
+    For the Sun and Moon, each return is searched from
+    the previous one plus the mean return period.
+
+    """
+    if ID not in RETURN_PERIOD:
+        yield from crossings(ID, lon, start, end)
+        return
+
+    period = RETURN_PERIOD[ID]
+    first = crossings(ID, lon, start, min(start + period * 1.1, end))
+    jd = next(first, None)
+    while jd is not None and jd < end:
+        yield jd
+        jd = _refine(ID, lon, jd + period)
+
+
+def ingresses(ID, start, end):
+    """ Yields (jd, sign) tuples when an object enters
+    a sign, including retrograde ingresses.
+
+    """
+    # Distance to the closest sign boundary
+    func = lambda jd: (objectLon(ID, jd) + 15) % 30 - 15
+    for jd in findRoots(func, _speed(ID), start, end, period=30):
+        sweID = const.NORTH_NODE if ID == const.SOUTH_NODE else ID
+        speed = swe.sweObject(sweID, jd)['lonspeed']
+        index = round(objectLon(ID, jd) / 30)
+        if speed < 0:
+            index -= 1
+        yield (jd, const.LIST_SIGNS[index % 12])
+
+
+def aspectsExact(IDa, IDb, angles, start, end):
+    """ Yields (jd, angle) tuples when the aspects in
+    'angles' between two objects are exact, in
+    chronological order.
+
+    """
+    targets = set()
+    for asp in angles:
+        targets.add(angle.norm(asp))
+        targets.add(angle.norm(-asp))
+
+    def search(target):
+        func = lambda jd: angle.closestdistance(
+            target,
+            objectLon(IDb, jd) - objectLon(IDa, jd)
+        )
+        for jd in findRoots(func, _speed(IDa, IDb), start, end):
+            yield (jd, min(target, 360 - target))
+
+    return heapq.merge(*[search(target) for target in sorted(targets)])
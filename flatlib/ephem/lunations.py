@@ -0,0 +1,125 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements an index of lunations (new
+    and full moons) over a range of julian dates, so
+    that the syzygy before any date is found by binary
+    search instead of an iterative search.
+
+    Lunations are found with the generic event solver
+    (see events.py). An index is selected with
+    tools.setLunations(), so that tools.syzygyJD and its
+    callers remain unchanged. Dates outside the index are
+    computed by the iterative method.
+
+    Index files can be generated from the command line:
+
+        python -m flatlib.ephem.lunations output.npz 1900/01/01 2100/01/01
+
+"""
+
+import argparse
+
+import numpy as np
+
+from . import events
+from flatlib import const
+from flatlib.datetime import Datetime
+
+
+# ---------------------- #
+#   LunationIndex Class  #
+# ---------------------- #
+
+class LunationIndex:
+    """ This class represents the list of new and full
+    moons between two julian dates.
+
+    """
+
+    def __init__(self, start, end, jds, types):
+        self.start = start
+        self.end = end
+        self.jds = jds      # Sorted julian dates of lunations
+        self.types = types  # 0 for new moons and 180 for full moons
+
+    @classmethod
+    def build(cls, start, end):
+        """ Builds the index of lunations between two
+        julian dates.
+
+        """
+        lunations = list(events.aspectsExact(const.SUN, const.MOON,
+                                             [0, 180], start, end))
+        return cls(start, end,
+                   np.array([jd for (jd, _) in lunations]),
+                   np.array([asp for (_, asp) in lunations], dtype=np.int16))
+
+    # === Persistence === #
+
+    def save(self, path):
+        """ Saves this index to a numpy .npz file. """
+        np.savez(path,
+                 range=np.array([self.start, self.end]),
+                 jds=self.jds,
+                 types=self.types)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads an index from a numpy .npz file. """
+        with np.load(path) as data:
+            start, end = data['range'].tolist()
+            return cls(start, end, data['jds'], data['types'])
+
+    # === Queries === #
+
+    def covers(self, jd):
+        """ Returns if this index has the lunation before
+        a julian date.
+
+        """
+        return (len(self.jds) > 0 and self.jds[0] <= jd < self.end)
+
+    def _index(self, jd):
+        """ Returns the index of the lunation before a
+        julian date.
+
+        """
+        return int(np.searchsorted(self.jds, jd, side='right')) - 1
+
+    def syzygyJD(self, jd):
+        """ Returns the julian date of the latest new or
+        full moon before a julian date.
+
+        """
+        return float(self.jds[self._index(jd)])
+
+    def syzygyType(self, jd):
+        """ Returns the type of the latest lunation before
+        a julian date (0 or 180).
+
+        """
+        return int(self.types[self._index(jd)])
+
+
+# === Command line === #
+
+def main(args=None):
+    """ Generates a lunation index for a date range. """
+    parser = argparse.ArgumentParser(
+        prog='python -m flatlib.ephem.lunations',
+        description='Generates an index of new and full moons.')
+    parser.add_argument('path', help='output file (.npz)')
+    parser.add_argument('start', help='start date (yyyy/mm/dd)')
+    parser.add_argument('end', help='end date (yyyy/mm/dd)')
+    args = parser.parse_args(args)
+
+    start = Datetime(args.start).jd
+    end = Datetime(args.end).jd
+    LunationIndex.build(start, end).save(args.path)
+
+
+if __name__ == '__main__':
+    main()
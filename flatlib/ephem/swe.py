@@ -11,6 +11,10 @@
   
 """
 
+import os
+from collections import OrderedDict
+
+import numpy as np
 import swisseph
 from flatlib import angle
 from flatlib import const
@@ -49,20 +53,131 @@ SWE_HOUSESYS = {
     const.HOUSES_MORINUS: b'M'
 }
 
+# Record type for batch object positions
+OBJECT_DTYPE = np.dtype([
+    ('lon', np.float64),
+    ('lat', np.float64),
+    ('lonspeed', np.float64),
+    ('latspeed', np.float64),
+])
+
+
+# Path of the swe files
+PATH = None
+
+# Default flags for object computations
+SWE_FLAGS = swisseph.FLG_SWIEPH | swisseph.FLG_SPEED
+
+
+# ---------------- #
+#   Cache Class    #
+# ---------------- #
+
+class SweCache:
+    """ This class implements a size-bounded LRU cache
+    for the raw Swiss Ephemeris calls. It is disabled
+    when 'maxsize' is zero.
+    
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def call(self, func, *args):
+        """ Returns func(*args), reusing a previous result
+        for the same arguments if available. 
+        
+        """
+        if self.maxsize <= 0:
+            return func(*args)
+
+        key = (func.__name__,) + args
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+        except KeyError:
+            pass
+
+        self.misses += 1
+        value = func(*args)
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def resize(self, maxsize):
+        """ Sets the maximum number of entries. """
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """ Removes all entries and resets counters. """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Global cache (disabled by default)
+CACHE = SweCache()
+
+# Interpolation tables (see chebyshev.py)
+TABLES = None
+
 
 # ==== Internal functions ==== #
 
 def setPath(path):
     """ Sets the path for the swe files. """
+    global PATH
+    PATH = path
     swisseph.set_ephe_path(path)
+    STAR_INDEX.clear()
+
+
+def setCache(maxsize):
+    """ Enables the cache of raw ephemeris calls with
+    a maximum number of entries. Zero disables it.
+    
+    """
+    CACHE.resize(maxsize)
+
+
+def setTables(tables):
+    """ Sets the interpolation tables used for object
+    positions. None restores the Swiss Ephemeris. 
+    
+    """
+    global TABLES
+    TABLES = tables
+
+
+def _calcUT(jd, obj, flags=SWE_FLAGS):
+    """ Returns the raw positions of an object. """
+    if TABLES and flags == SWE_FLAGS and TABLES.covers(obj, jd):
+        return TABLES.calc(obj, jd)
+    sweObj = SWE_OBJECTS[obj]
+    return CACHE.call(swisseph.calc_ut, jd, sweObj, flags)[0]
+
+
+def _houses(jd, lat, lon, hsys):
+    """ Returns the raw houses and angles. """
+    return CACHE.call(swisseph.houses, jd, lat, lon, hsys)
 
 
 # === Object functions === #
 
 def sweObject(obj, jd):
     """ Returns an object from the Ephemeris. """
-    sweObj = SWE_OBJECTS[obj]
-    sweList, flg = swisseph.calc_ut(jd, sweObj)
+    sweList = _calcUT(jd, obj)
     return {
         'id': obj,
         'lon': sweList[0],
@@ -74,22 +189,52 @@ def sweObject(obj, jd):
 
 def sweObjectLon(obj, jd):
     """ Returns the longitude of an object. """
-    sweObj = SWE_OBJECTS[obj]
-    sweList, flg = swisseph.calc_ut(jd, sweObj)
+    sweList = _calcUT(jd, obj)
     return sweList[0]
 
 
+def sweObjectsBatch(ids, jds):
+    """ Returns the positions of many objects for many
+    julian dates. 
+    
+    It returns a dict mapping each object ID to a
+    structured array (see OBJECT_DTYPE) with one
+    record for each julian date.
+    
+    """
+    jds = np.asarray(jds, dtype=np.float64).ravel()
+    res = {}
+    for obj in ids:
+        arr = np.empty(len(jds), dtype=OBJECT_DTYPE)
+        # Dates covered by the tables are interpolated
+        # and the others are computed one by one
+        missing = np.arange(len(jds))
+        if TABLES and len(jds) and TABLES.covers(obj, TABLES.start):
+            covered = (TABLES.start <= jds) & (jds < TABLES.end)
+            if covered.any():
+                arr[covered] = TABLES.positions(obj, jds[covered])
+            missing = np.flatnonzero(~covered)
+        # View the records as a (n, 4) float matrix so that
+        # each row is filled with a single assignment
+        rows = arr.view(np.float64).reshape(-1, 4)
+        for i in missing.tolist():
+            sweList = _calcUT(float(jds[i]), obj)
+            rows[i] = (sweList[0], sweList[1], sweList[3], sweList[4])
+        res[obj] = arr
+    return res
+
+
 def sweNextTransit(obj, jd, lat, lon, flag):
     """ Returns the julian date of the next transit of
     an object. The flag should be 'RISE' or 'SET'. 
     """
     # geopos/rsmi are needed for newer version of swisseph
     geopos = (lon, lat, 0)
-    rsmi = swisseph.CALC_SET | swisseph.BIT_DISC_CENTER | swisseph.BIT_NO_REFRACTION
+    flag = swisseph.CALC_RISE if flag == 'RISE' else swisseph.CALC_SET
+    rsmi = flag | swisseph.BIT_DISC_CENTER | swisseph.BIT_NO_REFRACTION
 
     sweObj = SWE_OBJECTS[obj]
-    flag = swisseph.CALC_RISE if flag == 'RISE' else swisseph.CALC_SET
-    trans = swisseph.rise_trans(jd, sweObj, rsmi, geopos, flag)
+    trans = swisseph.rise_trans(jd, sweObj, rsmi, geopos)
     return trans[1][0]
 
 
@@ -103,7 +248,7 @@ def sweHouses(jd, lat, lon, hsys):
     else:
         hsys = SWE_HOUSESYS[hsys]
     
-    hlist, ascmc = swisseph.houses(jd, lat, lon, hsys)
+    hlist, ascmc = _houses(jd, lat, lon, hsys)
     # Add first house to the end of 'hlist' so that we
     # can compute house sizes with an iterator 
     hlist += (hlist[0],)
@@ -126,7 +271,7 @@ def sweHouses(jd, lat, lon, hsys):
 def sweHousesLon(jd, lat, lon, hsys):
     """ Returns lists with house and angle longitudes. """
     hsys = SWE_HOUSESYS[hsys]
-    hlist, ascmc = swisseph.houses(jd, lat, lon, hsys)
+    hlist, ascmc = _houses(jd, lat, lon, hsys)
     angles = [
         ascmc[0],
         ascmc[1],
@@ -140,47 +285,154 @@ def sweHousesLon(jd, lat, lon, hsys):
 
 # Beware: the swisseph.fixstar_mag function is really 
 # slow because it parses the fixstars.cat file every 
-# time..
+# time. Magnitudes are read once from the catalogue
+# into the STAR_INDEX instead.
+
+# Catalogue files in order of preference
+STAR_FILES = ['sefstars.txt', 'fixstars.cat']
+
+# Map normalised star names to magnitudes
+STAR_INDEX = {}
+
+
+def _starKey(name):
+    """ Returns the star name as used in the index. """
+    return name.replace(' ', '').lower()
+
+
+def loadStarCatalogue(path=None):
+    """ Reads the star magnitudes from the fixed stars 
+    catalogue into the in-memory index. It uses the
+    swe files path by default.
+    
+    """
+    path = path or PATH or ''
+    STAR_INDEX.clear()
+    for filename in STAR_FILES:
+        filepath = os.path.join(path, filename)
+        if os.path.exists(filepath):
+            break
+    else:
+        return STAR_INDEX
+
+    with open(filepath, encoding='latin-1') as catalogue:
+        for line in catalogue:
+            if line.startswith('#') or not line.strip():
+                continue
+            fields = line.split(',')
+            if len(fields) < 14:
+                continue
+            # Keep the first entry of each name and
+            # nomenclature, as the Swiss Ephemeris does
+            mag = float(fields[13])
+            STAR_INDEX.setdefault(_starKey(fields[0]), mag)
+            STAR_INDEX.setdefault(',' + fields[1].strip(), mag)
+    return STAR_INDEX
+
+
+def sweFixedStarMag(star):
+    """ Returns the magnitude of a fixed star. """
+    if not STAR_INDEX:
+        loadStarCatalogue()
+    key = _starKey(star) if not star.startswith(',') else star
+    try:
+        return STAR_INDEX[key]
+    except KeyError:
+        mag = swisseph.fixstar2_mag(star)[0]
+        STAR_INDEX[key] = mag
+        return mag
+
 
 def sweFixedStar(star, jd):
     """ Returns a fixed star from the Ephemeris. """
     sweList, stnam, flg = swisseph.fixstar2_ut(star, jd)
-    mag = swisseph.fixstar2_mag(star)
     return {
         'id': star,
-        'mag': mag,
+        'mag': sweFixedStarMag(star),
         'lon': sweList[0],
         'lat': sweList[1]
     }
 
 
+def sweFixedStars(stars, jd):
+    """ Returns a list of fixed stars for a single
+    date from the Ephemeris. 
+    
+    """
+    return [sweFixedStar(star, jd) for star in stars]
+
+
 # === Eclipses === #
 
+# Eclipse kinds
+SOLAR_ECLIPSE = 'Solar'
+LUNAR_ECLIPSE = 'Lunar'
+
+# Eclipse catalogues by kind (see eclipses.py)
+ECLIPSES = {}
+
+
+def setEclipses(catalogue):
+    """ Sets the catalogue used for the eclipses of its
+    kind. 
+    
+    """
+    ECLIPSES[catalogue.kind] = catalogue
+
+
+def clearEclipses():
+    """ Removes all eclipse catalogues. """
+    ECLIPSES.clear()
+
+
+def eclipseGlobal(kind, jd, backward):
+    """ Returns the jd details of previous or next global 
+    eclipse from the Swiss Ephemeris.
+    
+    """
+    if kind == SOLAR_ECLIPSE:
+        sweList = swisseph.sol_eclipse_when_glob(jd, backwards=backward)
+        return {
+            'maximum': sweList[1][0],
+            'begin': sweList[1][2],
+            'end': sweList[1][3],
+            'totality_begin': sweList[1][4],
+            'totality_end': sweList[1][5],
+            'center_line_begin': sweList[1][6],
+            'center_line_end': sweList[1][7],
+        }
+    else:
+        sweList = swisseph.lun_eclipse_when(jd, backwards=backward)
+        return {
+            'maximum': sweList[1][0],
+            'partial_begin': sweList[1][2],
+            'partial_end': sweList[1][3],
+            'totality_begin': sweList[1][4],
+            'totality_end': sweList[1][5],
+            'penumbral_begin': sweList[1][6],
+            'penumbral_end': sweList[1][7],
+        }
+
+
+def _eclipse(kind, jd, backward):
+    """ Returns the previous or next eclipse from the 
+    catalogue if it covers the date, or from the Swiss 
+    Ephemeris otherwise.
+    
+    """
+    catalogue = ECLIPSES.get(kind)
+    if catalogue is not None:
+        eclipse = catalogue.prev(jd) if backward else catalogue.next(jd)
+        if eclipse is not None:
+            return eclipse
+    return eclipseGlobal(kind, jd, backward)
+
+
 def solarEclipseGlobal(jd, backward):
     """ Returns the jd details of previous or next global solar eclipse. """
-
-    sweList = swisseph.sol_eclipse_when_glob(jd, backward)
-    return {
-        'maximum': sweList[1][0],
-        'begin': sweList[1][2],
-        'end': sweList[1][3],
-        'totality_begin': sweList[1][4],
-        'totality_end': sweList[1][5],
-        'center_line_begin': sweList[1][6],
-        'center_line_end': sweList[1][7],
-    }
+    return _eclipse(SOLAR_ECLIPSE, jd, backward)
 
 
 def lunarEclipseGlobal(jd, backward):
     """ Returns the jd details of previous or next global lunar eclipse. """
-
-    sweList = swisseph.lun_eclipse_when(jd, backward)
-    return {
-        'maximum': sweList[1][0],
-        'partial_begin': sweList[1][2],
-        'partial_end': sweList[1][3],
-        'totality_begin': sweList[1][4],
-        'totality_end': sweList[1][5],
-        'penumbral_begin': sweList[1][6],
-        'penumbral_end': sweList[1][7],
-    }
+    return _eclipse(LUNAR_ECLIPSE, jd, backward)
@@ -16,6 +16,30 @@ from flatlib import utils
 # One arc-second error for iterative algorithms
 MAX_ERROR = 0.0003
 
+# Time precision of root finding (about 0.1 seconds)
+MAX_TIME_ERROR = 1e-6
+
+# Search steps in days for stations. They must be 
+# shorter than the minimum time between two stations.
+STATION_STEP = {
+    const.MERCURY: 4,
+    const.VENUS: 10,
+    const.MARS: 10,
+}
+STATION_STEP_DEFAULT = 20
+
+# Index of lunations for syzygies (see lunations.py)
+LUNATIONS = None
+
+
+def setLunations(index):
+    """ Sets the index of lunations used to find 
+    syzygies. None restores the iterative search.
+    
+    """
+    global LUNATIONS
+    LUNATIONS = index
+
 
 # === Object positions === #
 
@@ -24,12 +48,20 @@ def pfLon(jd, lat, lon):
     It considers diurnal or nocturnal conditions.
     
     """
-    sun = swe.sweObjectLon(const.SUN, jd)
+    sun = swe.sweObject(const.SUN, jd)
     moon = swe.sweObjectLon(const.MOON, jd)
-    asc = swe.sweHousesLon(jd, lat, lon,
-                           const.HOUSES_DEFAULT)[1][0]
+    asc, mc = swe.sweHousesLon(jd, lat, lon,
+                               const.HOUSES_DEFAULT)[1][:2]
+    diurnal = isSunAbove(sun['lon'], sun['lat'], mc, lat)
+    return pfLonFrom(sun['lon'], moon, asc, diurnal)
+
 
-    if isDiurnal(jd, lat, lon):
+def pfLonFrom(sun, moon, asc, diurnal):
+    """ Returns the ecliptic longitude of Pars Fortuna
+    given the longitudes of the Sun, Moon and Asc.
+    
+    """
+    if diurnal:
         return angle.norm(asc + moon - sun)
     else:
         return angle.norm(asc + sun - moon)
@@ -45,30 +77,47 @@ def isDiurnal(jd, lat, lon):
     sun = swe.sweObject(const.SUN, jd)
     mc = swe.sweHousesLon(jd, lat, lon,
                           const.HOUSES_DEFAULT)[1][1]
-    ra, decl = utils.eqCoords(sun['lon'], sun['lat'])
+    return isSunAbove(sun['lon'], sun['lat'], mc, lat)
+
+
+def isSunAbove(sunLon, sunLat, mc, lat):
+    """ Returns true if the sun is above the horizon
+    given its position, the MC and the latitude.
+    
+    """
+    ra, decl = utils.eqCoords(sunLon, sunLat)
     mcRA, _ = utils.eqCoords(mc, 0.0)
     return utils.isAboveHorizon(ra, decl, mcRA, lat)
 
 
 # === Iterative algorithms === #
 
-def syzygyJD(jd):
+def syzygyJD(jd, sun=None, moon=None):
     """ Finds the latest new or full moon and
-    returns the julian date of that event. 
+    returns the julian date of that event. The
+    Sun and Moon objects at 'jd' may be given if
+    already known.
     
     """
-    sun = swe.sweObjectLon(const.SUN, jd)
-    moon = swe.sweObjectLon(const.MOON, jd)
-    dist = angle.distance(sun, moon)
+    if LUNATIONS and LUNATIONS.covers(jd):
+        return LUNATIONS.syzygyJD(jd)
+
+    if sun is None:
+        sun = swe.sweObject(const.SUN, jd)
+    if moon is None:
+        moon = swe.sweObject(const.MOON, jd)
+    dist = angle.distance(sun['lon'], moon['lon'])
 
     # Offset represents the Syzygy type. 
     # Zero is conjunction and 180 is opposition.
     offset = 180 if (dist >= 180) else 0
+    dist -= offset
     while abs(dist) > MAX_ERROR:
-        jd = jd - dist / 13.1833  # Moon mean daily motion
-        sun = swe.sweObjectLon(const.SUN, jd)
-        moon = swe.sweObjectLon(const.MOON, jd)
-        dist = angle.closestdistance(sun - offset, moon)
+        # Newton step with the relative speed of the Moon
+        jd = jd - dist / (moon['lonspeed'] - sun['lonspeed'])
+        sun = swe.sweObject(const.SUN, jd)
+        moon = swe.sweObject(const.MOON, jd)
+        dist = angle.closestdistance(sun['lon'] - offset, moon['lon'])
     return jd
 
 
@@ -91,17 +140,97 @@ def solarReturnJD(jd, lon, forward=True):
     return jd
 
 
-# === Other algorithms === #
+# === Root finding === #
+
+def brent(func, a, b, fa=None, fb=None, xtol=MAX_TIME_ERROR, maxiter=100):
+    """ Finds a root of 'func' between 'a' and 'b' using
+    the Brent method. The function must have different
+    signs at both ends of the interval.
+    
+    """
+    fa = func(a) if fa is None else fa
+    fb = func(b) if fb is None else fb
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+
+    c, fc = a, fa
+    d = e = b - a
+    for i in range(maxiter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, fa = b, fb
+            b, fb = c, fc
+            c, fc = a, fa
+
+        tol = 2e-16 * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return b
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Attempt inverse quadratic interpolation
+            s = fb / fa
+            if a == c:
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            # Bisection
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = func(b)
+    return b
+
+
+# === Stations === #
+
+def _lonspeed(ID):
+    """ Returns a function of the longitude speed of 
+    an object. 
+    
+    """
+    return lambda jd: swe.sweObject(ID, jd)['lonspeed']
+
+
+def stationsBetween(ID, jd, end):
+    """ Yields the julian dates of every station of
+    a planet between two julian dates.
+    
+    """
+    speed = _lonspeed(ID)
+    step = STATION_STEP.get(ID, STATION_STEP_DEFAULT)
+    a, fa = jd, speed(jd)
+    while a < end:
+        b = min(a + step, end)
+        fb = speed(b)
+        if fa * fb <= 0 and fa != 0:
+            yield brent(speed, a, b, fa, fb)
+        a, fa = b, fb
+
 
 def nextStationJD(ID, jd):
-    """ Finds the aproximate julian date of the
-    next station of a planet.
+    """ Finds the julian date of the next station 
+    of a planet within 1000 days.
 
     """
-    speed = swe.sweObject(ID, jd)['lonspeed']
-    for i in range(2000):
-        nextjd = jd + i / 2
-        nextspeed = swe.sweObject(ID, nextjd)['lonspeed']
-        if speed * nextspeed <= 0:
-            return nextjd
+    for stationJD in stationsBetween(ID, jd, jd + 1000):
+        return stationJD
     return None
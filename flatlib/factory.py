@@ -0,0 +1,87 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements the construction of many
+    charts at once using a pool of worker processes.
+
+    Each record is a (date, pos) tuple or a (date, pos,
+    kwargs) tuple, where kwargs are the optional arguments
+    of the Chart class (hsys, IDs, etc). Charts are built
+    in the workers and sent back in their compact form
+    (see Chart.toDict), preserving the input order.
+
+"""
+
+import multiprocessing
+
+from .chart import Chart
+from .ephem import swe
+
+
+# === Worker functions === #
+
+def _initWorker(path):
+    """ Initialises the ephemeris of a worker process. """
+    if path:
+        swe.setPath(path)
+
+
+def _buildChart(record):
+    """ Builds a chart from a record and returns its
+    compact representation.
+
+    """
+    date, pos = record[0], record[1]
+    kwargs = record[2] if len(record) > 2 else {}
+    return Chart(date, pos, **kwargs).toDict()
+
+
+# ---------------------- #
+#   ChartFactory Class   #
+# ---------------------- #
+
+class ChartFactory:
+    """ This class builds charts in bulk using a
+    pool of worker processes.
+
+    """
+
+    def __init__(self, workers=None, chunksize=64):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunksize = chunksize
+
+    def iterDicts(self, records):
+        """ Yields the compact representation of the
+        charts in the same order as the records.
+
+        """
+        if self.workers <= 1:
+            for record in records:
+                yield _buildChart(record)
+            return
+
+        with multiprocessing.Pool(self.workers,
+                                  initializer=_initWorker,
+                                  initargs=(swe.PATH,)) as pool:
+            for chartDict in pool.imap(_buildChart, records,
+                                       self.chunksize):
+                yield chartDict
+
+    def iterCharts(self, records):
+        """ Yields charts in the same order as the records. """
+        for chartDict in self.iterDicts(records):
+            yield Chart.fromDict(chartDict)
+
+
+def buildCharts(records, workers=None, chunksize=64, compact=False):
+    """ Returns a generator with the charts for a list
+    of records. If 'compact' is true, it yields the
+    compact representation instead of Chart objects.
+
+    """
+    factory = ChartFactory(workers, chunksize)
+    if compact:
+        return factory.iterDicts(records)
+    return factory.iterCharts(records)
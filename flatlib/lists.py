@@ -11,8 +11,14 @@
 
 """
 
+import bisect
+
+import numpy as np
+
+from . import angle
 from . import aspects
 from . import const
+from .object import House
 
 
 # ---------------- #
@@ -46,7 +52,7 @@ class GenericList:
     def copy(self):
         """ Returns a deep copy of this list. """
         values = [obj.copy() for obj in self]
-        return GenericList(values)
+        return type(self)(values)
 
     def __iter__(self):
         """ Returns an iterator to this list. """
@@ -82,15 +88,90 @@ class ObjectList(GenericList):
 # ---------------- #
 
 class HouseList(GenericList):
-    """ Implements a list of houses. """
+    """ Implements a list of houses. 
+    
+    Houses are found by binary search on the sorted 
+    starts of the houses (the cusps with the House 
+    offset). The index is rebuilt when houses are 
+    added or moved. Single lookups check the found 
+    house with House.inHouse instead, which is enough
+    since houses do not overlap.
+    
+    """
 
-    def getHouseByLon(self, lon):
-        """ Returns a house given a longitude. """
+    def __init__(self, values=[]):
+        super().__init__(values)
+        self._index = None
+
+    def add(self, obj):
+        """ Adds an house to this list. """
+        super().add(obj)
+        self._index = None
+
+    def _getIndex(self, check=True):
+        """ Returns the index of houses sorted by their
+        starting longitude. If 'check' is true, the index
+        is rebuilt if houses were moved.
+        
+        """
+        if self._index is not None and not check:
+            return self._index
+        houses = list(self)
+        key = [(house.lon, house.size) for house in houses]
+        if self._index is None or self._index['key'] != key:
+            starts = [angle.norm(house.lon + House._OFFSET) for house in houses]
+            order = sorted(range(len(houses)), key=lambda i: starts[i])
+            self._index = {
+                'key': key,
+                'houses': houses,
+                'order': order,
+                'sorted': [starts[i] for i in order],
+                'starts': np.array(starts),
+                'sizes': np.array([house.size for house in houses]),
+            }
+        return self._index
+
+    def _scanHouse(self, lon):
+        """ Returns a house given a longitude by checking
+        each house in order.
+        
+        """
         for house in self:
             if house.inHouse(lon):
                 return house
         return None
 
+    def getHouseByLon(self, lon):
+        """ Returns a house given a longitude. """
+        index = self._getIndex(check=False)
+        if not index['houses']:
+            return None
+        pos = bisect.bisect_right(index['sorted'], angle.norm(lon)) - 1
+        house = index['houses'][index['order'][pos]]
+        if house.inHouse(lon):
+            return house
+        # Rounding at the house limits
+        return self._scanHouse(lon)
+
+    def housesOf(self, lons):
+        """ Returns the list of houses of an array of 
+        longitudes. 
+        
+        """
+        index = self._getIndex()
+        lons = np.mod(np.asarray(lons, dtype=np.float64).ravel(), 360)
+        if not index['houses']:
+            return [None] * len(lons)
+        order = np.array(index['order'])
+        pos = np.searchsorted(index['sorted'], lons, side='right') - 1
+        idx = order[pos]
+        valid = np.mod(lons - index['starts'][idx], 360) < index['sizes'][idx]
+
+        houses = index['houses']
+        return [houses[i] if ok else self._scanHouse(lon)
+                for (i, ok, lon) in zip(idx.tolist(), valid.tolist(),
+                                        lons.tolist())]
+
     def getObjectHouse(self, obj):
         """ Returns the house where an object is located. """
         return self.getHouseByLon(obj.lon)
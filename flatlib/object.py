@@ -7,6 +7,11 @@
     Astrology objects, such as planets, Houses 
     and Fixed-Stars.
 
+    Objects use __slots__ to keep their memory footprint
+    small, since charts may be kept in large numbers. The
+    sign, sign longitude and dms string are derived from 
+    the longitude when requested.
+
 """
 
 from . import const
@@ -20,6 +25,11 @@ import logging
 #   Generic Object   #
 # ------------------ #
 
+# Properties derived from the longitude and from
+# the houses of a chart
+DERIVED = ('sign', 'signlon', 'dms', 'house')
+
+
 class GenericObject:
     """ This class represents a generic object and
     includes properties which are common to all 
@@ -27,24 +37,38 @@ class GenericObject:
     
     """
 
+    __slots__ = ('id', 'type', 'lon', 'lat')
+
     def __init__(self):
         self.id = const.NO_PLANET
         self.type = const.OBJ_GENERIC
         self.lon = 0.0
         self.lat = 0.0
-        self.sign = const.ARIES
-        self.signlon = 0.0
-        self.dms = 0
+
     @classmethod
     def fromDict(cls, _dict):
         """ Builds instance from dictionary of properties. """
         obj = cls()
-        obj.__dict__.update(_dict)
+        for (key, value) in _dict.items():
+            if key not in DERIVED:
+                setattr(obj, key, value)
         return obj
 
+    def toDict(self):
+        """ Returns a dictionary with the properties of
+        this object. 
+        
+        """
+        res = {}
+        for klass in type(self).__mro__:
+            for key in getattr(klass, '__slots__', ()):
+                if key not in DERIVED and hasattr(self, key):
+                    res[key] = getattr(self, key)
+        return res
+
     def copy(self):
         """ Returns a deep copy of this object. """
-        return self.fromDict(self.__dict__)
+        return self.fromDict(self.toDict())
 
     def __str__(self):
         return '%s %s %s %s' % (
@@ -56,6 +80,21 @@ class GenericObject:
 
     # === Properties === #
 
+    @property
+    def sign(self):
+        """ Returns the sign of this object. """
+        return const.LIST_SIGNS[int(self.lon / 30.0)]
+
+    @property
+    def signlon(self):
+        """ Returns the longitude within the sign. """
+        return self.lon % 30
+
+    @property
+    def dms(self):
+        """ Returns the absolute longitude as a dms string. """
+        return utils.decimal_to_dms(self.lon)
+
     def orb(self):
         """ Returns the orb of this object. """
         return -1.0
@@ -77,8 +116,6 @@ class GenericObject:
     def relocate(self, lon):
         """ Relocates this object to a new longitude. """
         self.lon = angle.norm(lon)
-        self.signlon = self.lon % 30
-        self.sign = const.LIST_SIGNS[int(self.lon / 30.0)]
 
     def antiscia(self):
         """ Returns antiscia object. """
@@ -106,6 +143,8 @@ class Object(GenericObject):
     
     """
 
+    __slots__ = ('house_id', 'lonspeed', 'latspeed', 'house')
+
     def __init__(self):
         super().__init__()
         self.type = const.OBJ_PLANET
@@ -197,6 +236,8 @@ class Object(GenericObject):
 class House(GenericObject):
     """ This class represents a generic house cusp. """
 
+    __slots__ = ('size',)
+
     # The traditional house offset
     _OFFSET = -5.0
 
@@ -259,6 +300,8 @@ class House(GenericObject):
 class FixedStar(GenericObject):
     """ This class represents a generic fixed star. """
 
+    __slots__ = ('mag',)
+
     def __init__(self):
         super().__init__()
         self.type = const.OBJ_FIXED_STAR
@@ -12,12 +12,42 @@
     - in-zodiaco aspects of promissors to significators
     - in-mundo directions uses latitude of both promissors and significators
     
+    The arcs of all pairs of promissors and significators
+    are computed at once with numpy arrays (see arcs()).
+    
+    Arcs are converted to dates with the time keys of
+    Ptolemy (1º per year), Naibod (the mean motion of the
+    sun per year) or the true solar arc (the motion of the
+    sun in right ascension in the days after birth, one
+    day per year). See the TimeKey class.
+    
 """
 
+import bisect
+import heapq
+
+import numpy as np
+
 from flatlib import angle
 from flatlib import utils
 from flatlib import const
+from flatlib.datetime import Datetime
 from flatlib.dignities import tables
+from flatlib.ephem import eph
+
+# Time keys
+PTOLEMY = 'Ptolemy'
+NAIBOD = 'Naibod'
+SOLAR_ARC = 'Solar Arc'
+
+# Degrees of arc per year of the static keys
+KEY_RATES = {
+    PTOLEMY: 1.0,
+    NAIBOD: 0.98564733
+}
+
+# Length of the tropical year in days
+YEAR = 365.2422
 
 
 # === Base functions === #
@@ -59,6 +89,55 @@ def arc(pRA, pDecl, sRA, sDecl, mcRA, lat):
     return (pPropDist - sPropDist) * (pArc / 2.0)
 
 
+def _closestdistance(angle1, angle2):
+    """ Closest distance between arrays of angles, as
+    angle.closestdistance.
+    
+    """
+    dist = np.mod(angle2 - angle1, 360)
+    return np.where(dist <= 180, dist, dist - 360)
+
+
+def _dnarcs(decl, lat):
+    """ Returns the arrays of diurnal and nocturnal arcs
+    of an array of declinations, as utils.dnarcs.
+    
+    """
+    with np.errstate(invalid='ignore'):
+        ad = np.arcsin(np.tan(np.radians(decl)) * np.tan(np.radians(lat)))
+    dArc = 180 + 2 * np.degrees(ad)
+    return (dArc, 360 - dArc)
+
+
+def arcs(pRA, pDecl, sRA, sDecl, mcRA, lat):
+    """ Returns the matrix of arcs of direction between
+    arrays of promissors (rows) and significators 
+    (columns), as the arc function.
+    
+    """
+    pRA, pDecl = np.asarray(pRA), np.asarray(pDecl)
+    sRA, sDecl = np.asarray(sRA), np.asarray(sDecl)
+    pDArc, pNArc = _dnarcs(pDecl, lat)
+    sDArc, sNArc = _dnarcs(sDecl, lat)
+
+    # Select meridian and arcs to be used for each 
+    # significator, as in utils.isAboveHorizon
+    above = np.abs(_closestdistance(mcRA, sRA)) <= sDArc / 2.0 + 0.0003
+    mdRA = np.where(above, mcRA, angle.norm(mcRA + 180))
+    sArc = np.where(above, sDArc, sNArc)
+    pArc = np.where(above[None, :], pDArc[:, None], pNArc[:, None])
+
+    # Promissor and Significator distance to meridian
+    pDist = _closestdistance(mdRA[None, :], pRA[:, None])
+    sDist = _closestdistance(mdRA, sRA)[None, :]
+    pDist = np.where(pDist < sDist, pDist + 360, pDist)
+
+    # Meridian distances proportional to respective semi-arcs
+    sPropDist = sDist / (sArc / 2.0)
+    pPropDist = pDist / (pArc / 2.0)
+    return (pPropDist - sPropDist) * (pArc / 2.0)
+
+
 def getArc(prom, sig, mc, pos, zerolat):
     """ Returns the arc of direction between a promissor
     and a significator. Arguments are also the MC, the
@@ -253,9 +332,9 @@ class PrimaryDirections:
                 res.append(self.T(ID, sign))
         return res
 
-    def getList(self, aspList):
-        """ Returns a sorted list with all
-        primary directions. 
+    def _directions(self, aspList, maxArc):
+        """ Returns an unsorted list with all primary 
+        directions with arcs below maxArc.
         
         """
         # Significators
@@ -273,22 +352,45 @@ class PrimaryDirections:
 
         # Compute all
         res = []
-        for prom in promissors:
-            for sig in significators:
-                if (prom['id'] == sig['id']):
-                    continue
-                arcs = self._arc(prom, sig)
-                for (x, y) in [('arcm', 'M'), ('arcz', 'Z')]:
-                    arc = arcs[x]
-                    if 0 < arc < self.MAX_ARC:
-                        res.append([
-                            arcs[x],
-                            prom['id'],
-                            sig['id'],
-                            y,
-                        ])
-
-        return sorted(res)
+        promIDs = [prom['id'] for prom in promissors]
+        sigIDs = [sig['id'] for sig in significators]
+        same = np.array(promIDs)[:, None] == np.array(sigIDs)[None, :]
+        for (ra, decl, mode) in [('ra', 'decl', 'M'), ('raZ', 'declZ', 'Z')]:
+            matrix = arcs([prom[ra] for prom in promissors],
+                          [prom[decl] for prom in promissors],
+                          [sig[ra] for sig in significators],
+                          [sig[decl] for sig in significators],
+                          self.mcRA, self.lat)
+            valid = (matrix > 0) & (matrix < maxArc) & ~same
+            for (i, j) in zip(*np.nonzero(valid)):
+                res.append([
+                    float(matrix[i, j]),
+                    promIDs[i],
+                    sigIDs[j],
+                    mode,
+                ])
+        return res
+
+    def getList(self, aspList):
+        """ Returns a sorted list with all
+        primary directions. 
+        
+        """
+        return sorted(self._directions(aspList, self.MAX_ARC))
+
+    def iterList(self, aspList, maxArc=None):
+        """ Yields the primary directions in increasing 
+        order of arc, as getList, up to maxArc. 
+        
+        Directions are popped from a heap, so only the
+        directions consumed by the caller are ordered.
+        
+        """
+        maxArc = self.MAX_ARC if maxArc is None else min(maxArc, self.MAX_ARC)
+        heap = self._directions(aspList, maxArc)
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)
 
 
 # ------------------ #
@@ -299,35 +401,156 @@ class PDTable:
     """ Represents the Primary Directions table
     for a chart.
 
+    The table is indexed by arc, promissor, significator
+    and mode (M or Z). Arc ranges are found by bisection
+    and IDs by dict lookups. An ID matches the full ID of 
+    a promissor or significator (such as 'N_Sun_0') or 
+    any of its parts (such as 'Sun').
+
     """
 
     def __init__(self, chart, aspList=const.MAJOR_ASPECTS):
         pd = PrimaryDirections(chart)
+        self.chart = chart
         self.table = pd.getList(aspList)
+        self.timeKeys = {}
+        self._buildIndex()
+
+    def _buildIndex(self):
+        """ Builds the sorted list of arcs and the lists
+        of table indexes by promissor, significator and
+        mode.
+
+        """
+        self.arcs = [direction[0] for direction in self.table]
+        self.index = {'prom': {}, 'sig': {}, 'mode': {}}
+        for (i, (arc, prom, sig, mode)) in enumerate(self.table):
+            for key in _keys(prom):
+                self.index['prom'].setdefault(key, []).append(i)
+            for key in _keys(sig):
+                self.index['sig'].setdefault(key, []).append(i)
+            self.index['mode'].setdefault(mode, []).append(i)
+
+    def _window(self, arcmin, arcmax):
+        """ Returns the range of table indexes within the
+        min and max arcs.
+
+        """
+        i = 0 if arcmin is None else bisect.bisect_right(self.arcs, arcmin)
+        j = len(self.arcs) if arcmax is None else \
+            bisect.bisect_left(self.arcs, arcmax)
+        return (i, j)
 
     def view(self, arcmin, arcmax):
         """ Returns the directions within the
         min and max arcs.
 
         """
-        res = []
-        for direction in self.table:
-            if arcmin < direction[0] < arcmax:
-                res.append(direction)
-        return res
+        i, j = self._window(arcmin, arcmax)
+        return self.table[i:j]
 
     def bySignificator(self, ID):
         """ Returns all directions to a significator. """
-        res = []
-        for direction in self.table:
-            if ID in direction[2]:
-                res.append(direction)
-        return res
+        return [self.table[i] for i in self.index['sig'].get(ID, [])]
 
     def byPromissor(self, ID):
         """ Returns all directions to a promissor. """
-        res = []
-        for direction in self.table:
-            if ID in direction[1]:
-                res.append(direction)
-        return res
+        return [self.table[i] for i in self.index['prom'].get(ID, [])]
+
+    def filter(self, arcmin=None, arcmax=None, sig=None, prom=None, mode=None):
+        """ Returns the directions within the min and max
+        arcs, filtered by significator, promissor and mode.
+        Arguments set to None are ignored.
+
+        """
+        i, j = self._window(arcmin, arcmax)
+        lists = [self.index[field].get(key, []) for (field, key) in
+                 [('sig', sig), ('prom', prom), ('mode', mode)]
+                 if key is not None]
+        if not lists:
+            return self.table[i:j]
+
+        # Walk the shortest index list within the arcs and
+        # check the others by bisection
+        lists.sort(key=len)
+        first = lists[0]
+        a = bisect.bisect_left(first, i)
+        b = bisect.bisect_left(first, j)
+        return [self.table[k] for k in first[a:b]
+                if all(_contains(other, k) for other in lists[1:])]
+
+    def getTimeKey(self, key=NAIBOD):
+        """ Returns the time key of the chart, which is
+        built only once.
+
+        """
+        if key not in self.timeKeys:
+            self.timeKeys[key] = TimeKey(self.chart, key)
+        return self.timeKeys[key]
+
+    def dates(self, key=NAIBOD, directions=None):
+        """ Returns the dates of the directions of this
+        table or of a list of directions.
+
+        """
+        directions = self.table if directions is None else directions
+        timeKey = self.getTimeKey(key)
+        return timeKey.toDates([direction[0] for direction in directions])
+
+
+def _keys(ID):
+    """ Returns the keys indexing a promissor or
+    significator ID.
+
+    """
+    return set([ID] + ID.split('_'))
+
+
+def _contains(indexes, k):
+    """ Returns if a sorted list of indexes contains k. """
+    pos = bisect.bisect_left(indexes, k)
+    return pos < len(indexes) and indexes[pos] == k
+
+
+# ------------------ #
+#   Time Key Class   #
+# ------------------ #
+
+class TimeKey:
+    """ This class converts arcs of direction of a 
+    chart to dates using a lookup table of arcs and 
+    julian dates.
+
+    """
+
+    def __init__(self, chart, key=NAIBOD, maxArc=PrimaryDirections.MAX_ARC):
+        self.key = key
+        self.jd = chart.date.jd
+        self.utcoffset = chart.date.utcoffset
+        if key == SOLAR_ARC:
+            self.arcs, self.years = self._solarArc(maxArc)
+        else:
+            self.arcs = np.array([0.0, maxArc])
+            self.years = self.arcs / KEY_RATES[key]
+
+    def _solarArc(self, maxArc):
+        """ Returns the arcs of the sun in right ascension
+        and the years (days after birth) of each arc.
+
+        """
+        days = np.arange(0, int(maxArc / 0.9) + 2, dtype=np.float64)
+        sun = eph.getObjectArrays([const.SUN], self.jd + days, 0, 0)[const.SUN]
+        ra = [utils.eqCoords(lon, lat)[0] for (lon, lat) in
+              zip(sun['lon'].tolist(), sun['lat'].tolist())]
+        ra = np.degrees(np.unwrap(np.radians(ra)))
+        return (ra - ra[0], days)
+
+    def toJD(self, arcs):
+        """ Returns the julian dates of an array of arcs. """
+        years = np.interp(arcs, self.arcs, self.years)
+        return self.jd + years * YEAR
+
+    def toDates(self, arcs):
+        """ Returns the dates of a list of arcs. """
+        return [Datetime.fromJD(jd, self.utcoffset)
+                for jd in self.toJD(arcs).tolist()]
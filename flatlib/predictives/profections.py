@@ -6,13 +6,37 @@
     This module provides useful functions for 
     handling profections.
     
+    A timeline of profections over many dates searches
+    the solar returns of the whole span only once and
+    yields ProfectionChart views, which rotate the natal
+    objects only when they are requested.
+    
 """
 
-import math
+import numpy as np
+
 from flatlib import const
+from flatlib.datetime import Datetime
+from flatlib.ephem import eph
 from flatlib.ephem import ephem
 
 
+# === Private functions === #
+
+def _rotation(chart, jd, prevSr, nextSr):
+    """ Returns the rotation of a chart at a julian date
+    given the julian dates of the previous and next 
+    solar returns.
+    
+    """
+    # In one year, rotate chart 30º
+    rotation = 30 * (jd - prevSr) / (nextSr - prevSr)
+
+    # Include 30º for each previous year
+    age = np.floor((jd - chart.date.jd) / 365.25)
+    return 30 * age + rotation
+
+
 def compute(chart, date, fixedObjects=False):
     """ Returns a profection chart for a given
     date. Receives argument 'fixedObjects' to
@@ -24,21 +48,99 @@ def compute(chart, date, fixedObjects=False):
     prevSr = ephem.prevSolarReturn(date, sun.lon)
     nextSr = ephem.nextSolarReturn(date, sun.lon)
 
-    # In one year, rotate chart 30º
-    rotation = 30 * (date.jd - prevSr.jd) / (nextSr.jd - prevSr.jd)
+    rotation = float(_rotation(chart, date.jd, prevSr.jd, nextSr.jd))
+    return ProfectionChart(chart, date, rotation, fixedObjects).toChart()
 
-    # Include 30º for each previous year
-    age = math.floor((date.jd - chart.date.jd) / 365.25)
-    rotation = 30 * age + rotation
-
-    # Create a copy of the chart and rotate content
-    pChart = chart.copy()
-    for obj in pChart.objects:
-        if not fixedObjects:
-            obj.relocate(obj.lon + rotation)
-    for house in pChart.houses:
-        house.relocate(house.lon + rotation)
-    for angle in pChart.angles:
-        angle.relocate(angle.lon + rotation)
-
-    return pChart
+
+def profectionTimeline(chart, start, end, step=30, fixedObjects=False):
+    """ Yields the profection charts between two dates 
+    with a step in days, as ProfectionChart views.
+    Receives argument 'fixedObjects' to fix chart 
+    objects in their natal locations.
+    
+    The solar returns of the whole span are computed
+    once, and the rotations of all dates are derived
+    from them.
+    
+    """
+    sun = chart.getObject(const.SUN)
+    jds = np.arange(start.jd, end.jd, step)
+    if len(jds) == 0:
+        return
+    srs = np.array([
+        eph.prevSolarReturn(start.jd, sun.lon)
+    ] + list(eph.returnsBetween(const.SUN, sun.lon, start.jd, 
+                                end.jd + 366)))
+
+    # Previous and next solar returns of each date
+    i = np.searchsorted(srs, jds, side='right') - 1
+    rotations = _rotation(chart, jds, srs[i], srs[i + 1])
+    for (jd, rotation) in zip(jds.tolist(), rotations.tolist()):
+        date = Datetime.fromJD(jd, start.utcoffset)
+        yield ProfectionChart(chart, date, rotation, fixedObjects)
+
+
+# ------------------------- #
+#   ProfectionChart Class   #
+# ------------------------- #
+
+class ProfectionChart:
+    """ This class represents a profection chart as a 
+    view of a natal chart rotated by an arc. Objects,
+    houses and angles are rotated when requested.
+    
+    """
+
+    def __init__(self, chart, date, rotation, fixedObjects=False):
+        self.chart = chart
+        self.date = date
+        self.rotation = rotation
+        self.fixedObjects = fixedObjects
+
+    def _rotate(self, obj):
+        """ Returns a rotated copy of an object. """
+        obj = obj.copy()
+        obj.relocate(obj.lon + self.rotation)
+        return obj
+
+    def getObject(self, ID):
+        """ Returns an object from the chart. """
+        obj = self.chart.getObject(ID)
+        if self.fixedObjects:
+            return obj.copy()
+        return self._rotate(obj)
+
+    def getHouse(self, ID):
+        """ Returns an house from the chart. """
+        return self._rotate(self.chart.getHouse(ID))
+
+    def getAngle(self, ID):
+        """ Returns an angle from the chart. """
+        return self._rotate(self.chart.getAngle(ID))
+
+    def get(self, ID):
+        """ Returns an object, house or angle 
+        from the chart.
+        
+        """
+        if ID.startswith('House'):
+            return self.getHouse(ID)
+        elif ID in const.LIST_ANGLES:
+            return self.getAngle(ID)
+        else:
+            return self.getObject(ID)
+
+    def toChart(self):
+        """ Returns a full copy of the natal chart with 
+        all contents rotated.
+        
+        """
+        pChart = self.chart.copy()
+        for obj in pChart.objects.values():
+            if not self.fixedObjects:
+                obj.relocate(obj.lon + self.rotation)
+        for house in pChart.houses:
+            house.relocate(house.lon + self.rotation)
+        for angle in pChart.angles:
+            angle.relocate(angle.lon + self.rotation)
+        return pChart
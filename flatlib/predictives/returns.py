@@ -4,8 +4,7 @@
     
 
     This module provides useful functions for 
-    handling solar and lunar returns.
-    It only handles solar returns for now.
+    handling solar, lunar and planetary returns.
     
 """
 
@@ -21,7 +20,8 @@ def _computeChart(chart, date):
     """
     pos = chart.pos
     hsys = chart.hsys
-    IDs = [obj.id for obj in chart.objects]
+    IDs = [obj.id for obj in chart.objects.values()
+           if obj.type != const.OBJ_FIXED_STAR]
     return Chart(date, pos, IDs=IDs, hsys=hsys)
 
 
@@ -43,3 +43,38 @@ def prevSolarReturn(chart, date):
     sun = chart.getObject(const.SUN)
     srDate = ephem.prevSolarReturn(date, sun.lon)
     return _computeChart(chart, srDate)
+
+
+# ------------------ #
+#    Return Class    #
+# ------------------ #
+
+class Return:
+    """ This class represents the return of an object
+    of a Chart. The return chart is only computed
+    when requested.
+    
+    """
+
+    def __init__(self, chart, ID, date):
+        self.natal = chart
+        self.id = ID
+        self.date = date
+        self._chart = None
+
+    def getChart(self):
+        """ Returns the chart of this return. """
+        if self._chart is None:
+            self._chart = _computeChart(self.natal, self.date)
+        return self._chart
+
+
+def returnSeries(chart, ID, start, end):
+    """ Yields every return of an object of a Chart 
+    between two dates, such as solar, lunar or
+    planetary returns.
+    
+    """
+    obj = chart.getObject(ID)
+    for date in ephem.returnsBetween(ID, obj.lon, start, end):
+        yield Return(chart, ID, date)
@@ -0,0 +1,135 @@
+"""
+    This file is part of flatlib - (C) FlatAngle
+    Author: João Ventura (flatangleweb@gmail.com)
+
+
+    This module implements a scanner of aspects from
+    transiting objects to the objects of a natal Chart.
+
+    For each pair of transiting and natal objects, the
+    scanner follows the angular distance between them
+    and finds when it crosses the limits of the orb of
+    each aspect (start and end of orb) and the exact
+    aspect. Orbs follow the rules of the aspects module.
+
+    The search steps forward in time using the maximum
+    speed of the transiting object: no event can happen
+    before the distance to the nearest limit is covered,
+    so intervals without aspects are skipped.
+
+"""
+
+import heapq
+
+import numpy as np
+
+from flatlib import angle
+from flatlib import aspects
+from flatlib import const
+from flatlib.ephem import ephem
+from flatlib.ephem import events
+from flatlib.ephem import tools
+from flatlib.datetime import Datetime
+
+# Event types
+ORB_START = 'Start'
+EXACT = const.EXACT
+ORB_END = 'End'
+
+
+# === Private functions === #
+
+def _levels(transit, natal, aspList):
+    """ Returns the list of (distance, aspect, orb, target)
+    levels where events happen for a pair of objects. A 
+    zero orb is the exact aspect.
+
+    """
+    res = []
+    for asp in aspList:
+        orb = aspects.allowedOrb(transit, natal, asp)
+        if orb < 0:
+            continue
+        for target in set([angle.norm(asp), angle.norm(-asp)]):
+            res.append((target, asp, 0, target))
+            if orb > 0:
+                res.append((angle.norm(target - orb), asp, orb, target))
+                res.append((angle.norm(target + orb), asp, orb, target))
+    return res
+
+
+def _distances(dist, targets):
+    """ Returns the signed distances from each level to
+    an angular distance.
+
+    """
+    return np.mod(dist - targets + 180, 360) - 180
+
+
+def _scanPair(transit, natal, aspList, start, end):
+    """ Yields the events of a transiting object to a
+    natal object between two julian dates.
+
+    """
+    levels = _levels(transit, natal, aspList)
+    if not levels:
+        return
+    targets = np.array([level[0] for level in levels])
+
+    ID = transit.id
+    speed = events.MAX_SPEED.get(ID, events.MAX_SPEED_DEFAULT)
+    dist = lambda jd: events.objectLon(ID, jd) - natal.lon
+
+    a = start
+    fa = _distances(dist(a), targets)
+    while a < end:
+        b = min(a + max(np.min(np.abs(fa)) / speed, events.MIN_STEP), end)
+        distB = dist(b)
+        fb = _distances(distB, targets)
+
+        # Every level crossed between 'a' and 'b', including
+        # levels with the same distance
+        crossed = (fa * fb <= 0) & (fa != 0) & (np.abs(fa - fb) < 180)
+        found = []
+        for i in np.flatnonzero(crossed).tolist():
+            level = levels[i]
+            func = lambda jd: angle.closestdistance(level[0], dist(jd))
+            event = EXACT
+            if level[2] > 0:
+                sep = angle.closestdistance(level[3], distB)
+                event = ORB_START if abs(sep) < level[2] else ORB_END
+            found.append({
+                'jd': tools.brent(func, a, b, float(fa[i]), float(fb[i])),
+                'transit': ID,
+                'natal': natal.id,
+                'type': level[1],
+                'event': event,
+            })
+        found.sort(key=lambda e: e['jd'])
+        yield from found
+        a, fa = b, fb
+
+
+# === Public functions === #
+
+def scan(chart, IDs, aspList, start, end):
+    """ Yields the aspect events of transiting objects to
+    the objects of a natal chart between two dates, in
+    chronological order.
+
+    Each event is a dict with the date, the transiting
+    and natal object IDs, the aspect type and the event
+    type (ORB_START, EXACT or ORB_END).
+
+    """
+    natals = list(chart.objects.values()) + list(chart.angles)
+    generators = []
+    for ID in IDs:
+        transit = ephem.getObject(ID, start, chart.pos)
+        for natal in natals:
+            generators.append(_scanPair(transit, natal, aspList,
+                                        start.jd, end.jd))
+
+    for event in heapq.merge(*generators, key=lambda e: e['jd']):
+        event['date'] = Datetime.fromJD(event['jd'], start.utcoffset)
+        yield event
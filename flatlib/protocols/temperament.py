@@ -14,7 +14,6 @@
 """
 
 from flatlib import const, dignities
-from flatlib import aspects
 from flatlib import props
 from flatlib.dignities import essential
 
@@ -89,7 +88,8 @@ def singleFactor(factors, chart, factor, obj, aspect=None):
 def modifierFactor(chart, factor, factorObj, otherObj, aspList):
     """ Computes a factor for a modifier. """
 
-    asp = aspects.aspectType(factorObj, otherObj, aspList)
+    grid = chart.getAspectGrid(aspList)
+    asp = grid.aspectType(factorObj.id, otherObj.id)
     if asp != const.NO_ASPECT:
         return {
             'factor': factor,
@@ -134,7 +134,7 @@ def getFactors(chart):
     aspList = [60, 90, 120, 180]
     planetsAspAsc = chart.objects.getObjectsAspecting(asc, aspList)
     for obj in planetsAspAsc:
-        aspect = aspects.aspectType(obj, asc, aspList)
+        aspect = chart.getAspectGrid(aspList).aspectType(obj.id, asc.id)
         singleFactor(factors, chart, ASC_PLANETS_ASP, obj, aspect)
 
     # Moon sign and phase
@@ -157,7 +157,7 @@ def getFactors(chart):
     aspList = [60, 90, 120, 180]
     planetsAspMoon = chart.objects.getObjectsAspecting(moon, aspList)
     for obj in planetsAspMoon:
-        aspect = aspects.aspectType(obj, moon, aspList)
+        aspect = chart.getAspectGrid(aspList).aspectType(obj.id, moon.id)
         singleFactor(factors, chart, MOON_PLANETS_ASP, obj, aspect)
 
     # Sun season
@@ -68,15 +68,14 @@ class ChartDynamics:
         list of possible aspects. 
         
         """
-        obj = self.chart.getObject(ID)
+        grid = self.chart.getAspectGrid(aspList)
         res = []
 
         for otherID in const.LIST_SEVEN_PLANETS:
             if ID == otherID:
                 continue
 
-            otherObj = self.chart.getObject(otherID)
-            aspType = aspects.aspectType(obj, otherObj, aspList)
+            aspType = grid.aspectType(ID, otherID)
             if aspType != const.NO_ASPECT:
                 res.append({
                     'id': otherID,
@@ -98,16 +97,15 @@ class ChartDynamics:
             const.NO_MOVEMENT: []
         }
 
-        objA = self.chart.getObject(ID)
+        grid = self.chart.getAspectGrid(aspList)
         valid = self.validAspects(ID, aspList)
         for elem in valid:
-            objB = self.chart.getObject(elem['id'])
-            asp = aspects.getAspect(objA, objB, aspList)
-            role = asp.getRole(objA.id)
+            asp = grid.getAspect(ID, elem['id'])
+            role = asp.getRole(ID)
             if role['inOrb']:
                 movement = role['movement']
                 res[movement].append({
-                    'id': objB.id,
+                    'id': elem['id'],
                     'asp': asp.type,
                     'orb': asp.orb
                 })
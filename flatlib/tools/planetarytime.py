@@ -75,22 +75,32 @@ def hourTable(date, pos):
     lastSunrise = ephem.lastSunrise(date, pos)
     middleSunset = ephem.nextSunset(lastSunrise, pos)
     nextSunrise = ephem.nextSunrise(date, pos)
+    return _hourTable(lastSunrise, middleSunset, nextSunrise)
+
+
+def _hourTable(sunrise, sunset, nextSunrise):
+    """ Creates the planetary hour table given the
+    dates of a sunrise, the following sunset and the
+    next sunrise.
+    
+    """
+    dow = sunrise.date.dayofweek()
     table = []
 
     # Create diurnal hour sequence
-    length = (middleSunset.jd - lastSunrise.jd) / 12.0
+    length = (sunset.jd - sunrise.jd) / 12.0
     for i in range(12):
-        start = lastSunrise.jd + i * length
+        start = sunrise.jd + i * length
         end = start + length
-        ruler = nthRuler(i, lastSunrise.date.dayofweek())
+        ruler = nthRuler(i, dow)
         table.append([start, end, ruler])
 
     # Create nocturnal hour sequence
-    length = (nextSunrise.jd - middleSunset.jd) / 12.0
+    length = (nextSunrise.jd - sunset.jd) / 12.0
     for i in range(12):
-        start = middleSunset.jd + i * length
+        start = sunset.jd + i * length
         end = start + length
-        ruler = nthRuler(i + 12, lastSunrise.date.dayofweek())
+        ruler = nthRuler(i + 12, dow)
         table.append([start, end, ruler])
 
     return table
@@ -102,6 +112,22 @@ def getHourTable(date, pos):
     return HourTable(table, date)
 
 
+def getHourTables(start, end, pos):
+    """ Returns the list of HourTable objects of every
+    day between two dates, starting at the day of the 
+    'start' date. Sunrises and sunsets are computed once
+    and shared by consecutive days.
+    
+    """
+    events = ephem.sunriseSunsets(start, end, pos)
+    res = []
+    for i in range(0, len(events) - 2, 2):
+        sunrise, sunset, nextSunrise = events[i:i + 3]
+        table = _hourTable(sunrise, sunset, nextSunrise)
+        res.append(HourTable(table, sunrise))
+    return res
+
+
 # ------------------- #
 #   HourTable Class   #
 # ------------------- #
@@ -52,13 +52,12 @@ sun = ephem.getObject(const.SUN, dt, pos)
 # Collect hour differences for the following 100 years
 hdiff = []
 span = 100
-for year in range(date[0], date[0] + 1 + span):
-    
-    # Get solar return of the year
-    dt = Datetime('%s/01/01' % year, '00:00')
-    sr = ephem.nextSolarReturn(dt, sun.lon)
+start = Datetime('%s/01/01' % date[0], '00:00')
+end = Datetime('%s/01/01' % (date[0] + 1 + span), '00:00')
+for sr in ephem.returnsBetween(const.SUN, sun.lon, start, end):
     
     # Create anniversary date for the year
+    year = sr.date.date()[0]
     date[0] = year
     an = Datetime(date, time)
     
@@ -0,0 +1,55 @@
+import unittest
+
+from flatlib import aspects
+from flatlib import const
+from flatlib.chart import Chart
+from flatlib.datetime import Datetime
+from flatlib.geopos import GeoPos
+
+
+class AspectTests(unittest.TestCase):
+
+    def setUp(self):
+        date = Datetime('2015/03/13', '17:00', '+00:00')
+        pos = GeoPos('38n32', '8w54')
+        self.chart = Chart(date, pos, IDs=const.LIST_OBJECTS,
+                           include_fixed_stars=True)
+
+    def test_all_aspects(self):
+        """All aspects must match pairwise aspects without duplicates."""
+        objs = list(self.chart.objects.values())
+        expected = set()
+        for obj1 in objs:
+            for obj2 in objs:
+                if obj1 is obj2:
+                    continue
+                asp = aspects.getAspect(obj1, obj2, const.ALL_ASPECTS)
+                if asp.exists():
+                    expected.add((asp.active.id, asp.passive.id,
+                                  asp.type, asp.orb, asp.active.movement))
+
+        result = [(asp.active.id, asp.passive.id, asp.type, asp.orb,
+                   asp.active.movement) for asp in
+                  aspects.getAllAspects(self.chart.objects, const.ALL_ASPECTS)]
+        self.assertEqual(len(result), len(set(result)))
+        self.assertEqual(set(result), expected)
+
+    def test_aspect_grid(self):
+        """Grid aspects must match pairwise aspects."""
+        grid = self.chart.getAspectGrid(const.ALL_ASPECTS)
+        objs = list(self.chart.objects.values()) + list(self.chart.angles)
+        for obj1 in objs:
+            for obj2 in objs:
+                if obj1 is obj2:
+                    continue
+                asp = aspects.getAspect(obj1, obj2, const.ALL_ASPECTS)
+                gridAsp = grid.getAspect(obj1.id, obj2.id)
+                self.assertEqual(gridAsp.type, asp.type)
+                self.assertEqual(gridAsp.orb, asp.orb)
+                self.assertEqual(gridAsp.active.id, asp.active.id)
+                self.assertEqual(gridAsp.movement(), asp.movement())
+
+        # Cached until objects change
+        self.assertIs(self.chart.getAspectGrid(const.ALL_ASPECTS), grid)
+        self.chart.getObject(const.MOON).relocate(0)
+        self.assertIsNot(self.chart.getAspectGrid(const.ALL_ASPECTS), grid)
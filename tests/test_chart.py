@@ -1,8 +1,11 @@
 import unittest
 
 from flatlib import const
+from flatlib.batch import ChartBatch
 from flatlib.chart import Chart
 from flatlib.datetime import Datetime
+from flatlib.dignities import essential
+from flatlib.ephem import ephem
 from flatlib.geopos import GeoPos
 
 
@@ -17,3 +20,94 @@ class ChartTests(unittest.TestCase):
         chart = Chart(self.date, self.pos, hsys=const.HOUSES_MORINUS)
         sr_chart = chart.solarReturn(2018)
         self.assertEqual(chart.hsys, sr_chart.hsys)
+
+    def test_dict_roundtrip(self):
+        """Charts rebuilt from dicts keep their content."""
+        chart = Chart(self.date, self.pos)
+        chart.getObjectWithHouse(const.SUN)
+        data = chart.toDict()
+        self.assertEqual(data['date'], (chart.date.jd, 0.0))
+        self.assertNotIn('house', data['objects'][0])
+        copy = Chart.fromDict(data)
+        self.assertEqual(copy.date.jd, chart.date.jd)
+        self.assertEqual(copy.pos.lat, chart.pos.lat)
+        for obj in chart.objects.values():
+            self.assertEqual(obj.lon, copy.getObject(obj.id).lon)
+        self.assertEqual(chart.getHouse(const.HOUSE1).lon,
+                         copy.getHouse(const.HOUSE1).lon)
+        self.assertEqual(chart.getAngle(const.MC).lon,
+                         copy.getAngle(const.MC).lon)
+
+    def test_chart_data(self):
+        """Charts built in one pass match single objects."""
+        chart = Chart(self.date, self.pos, hsys=const.HOUSES_MORINUS)
+        for ID in const.LIST_OBJECTS_TRADITIONAL:
+            obj = ephem.getObject(ID, self.date, self.pos)
+            self.assertAlmostEqual(chart.getObject(ID).lon, obj.lon, places=4)
+
+    def test_house_index(self):
+        """Indexed house lookups match the linear scan."""
+        chart = Chart(self.date, self.pos, hsys=const.HOUSES_PLACIDUS)
+        houses = chart.houses
+        lons = [i * 0.25 for i in range(1440)]
+        lons += [house.lon - 5 for house in houses]
+        bulk = houses.housesOf(lons)
+        for lon, house in zip(lons, bulk):
+            expected = houses._scanHouse(lon)
+            self.assertIs(houses.getHouseByLon(lon), expected)
+            self.assertIs(house, expected)
+
+    def test_slotted_objects(self):
+        """Objects have no instance dict and derive sign info."""
+        chart = Chart(self.date, self.pos)
+        sun = chart.getObject(const.SUN).copy()
+        self.assertFalse(hasattr(sun, '__dict__'))
+        self.assertEqual(sun.sign, const.PISCES)
+        sun.relocate(31.5)
+        self.assertEqual(sun.sign, const.TAURUS)
+        self.assertAlmostEqual(sun.signlon, 1.5)
+        self.assertEqual(chart.getObject(const.SUN).sign, const.PISCES)
+
+    def test_build_charts(self):
+        """Charts built in a process pool keep input order."""
+        from flatlib.factory import buildCharts
+        dates = [Datetime('2015/03/%02d' % d, '17:00', '+00:00')
+                 for d in range(1, 6)]
+        records = [(date, self.pos) for date in dates]
+        charts = list(buildCharts(records, workers=2, chunksize=2))
+        for date, chart in zip(dates, charts):
+            expected = Chart(date, self.pos).getObject(const.SUN)
+            self.assertEqual(chart.getObject(const.SUN).lon, expected.lon)
+
+    def test_chart_batch(self):
+        """Batch queries match the queries of each chart."""
+        dates = [Datetime.fromJD(self.date.jd + 37.3 * i, '+00:00')
+                 for i in range(12)]
+        charts = [Chart(date, self.pos) for date in dates]
+        batch = ChartBatch.build(dates, self.pos)
+        self.assertEqual(len(batch), 12)
+        diurnal = batch.isDiurnal()
+        phases = batch.moonPhase()
+        houses = batch.houseIndex(const.MARS)
+        scores = batch.score(const.VENUS)
+        for i, chart in enumerate(charts):
+            self.assertEqual(diurnal[i], chart.isDiurnal())
+            self.assertEqual(phases[i], chart.getMoonPhase())
+            mars = chart.getObject(const.MARS)
+            house = chart.houses.getObjectHouse(mars)
+            self.assertEqual(const.LIST_HOUSES[houses[i]], house.id)
+            venus = chart.getObject(const.VENUS)
+            self.assertEqual(scores[i], essential.score(
+                venus.id, venus.sign, venus.signlon))
+            view = batch.getChart(i)
+            self.assertAlmostEqual(view.getObject(const.MOON).lon,
+                                   chart.getObject(const.MOON).lon)
+
+        # Charts at distinct locations
+        positions = [GeoPos(10.0 + 3 * i, -20.0 + 5 * i) for i in range(12)]
+        batch = ChartBatch.build(dates, positions)
+        for i, date in enumerate(dates):
+            chart = Chart(date, positions[i])
+            for ID in [const.SUN, const.SOUTH_NODE, const.PARS_FORTUNA]:
+                self.assertAlmostEqual(batch.getLon(ID)[i],
+                                       chart.getObject(ID).lon, places=6)
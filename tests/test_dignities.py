@@ -0,0 +1,39 @@
+import unittest
+
+from flatlib import const
+from flatlib.dignities import essential
+
+
+class EssentialTests(unittest.TestCase):
+
+    def tearDown(self):
+        essential.setTerms(essential.EGYPTIAN_TERMS)
+        essential.setFaces(essential.CHALDEAN_FACES)
+
+    def check(self):
+        """Compiled lookups match the dignity tables."""
+        lons = [i * 0.1 for i in range(3600)]
+        scores = {ID: essential.scoreArray(ID, lons)
+                  for ID in const.LIST_SEVEN_PLANETS}
+        almutems = essential.almutemArray(lons)
+        for i, lon in enumerate(lons):
+            sign = const.LIST_SIGNS[int(lon / 30)]
+            signlon = lon % 30
+            info = essential._getInfo(sign, signlon)
+            self.assertEqual(essential.getInfo(sign, signlon), info)
+            res = [None, 0]
+            for ID in const.LIST_SEVEN_PLANETS:
+                score = essential._infoScore(ID, info)
+                self.assertEqual(essential.score(ID, sign, signlon), score)
+                self.assertEqual(scores[ID][i], score)
+                if score > res[1]:
+                    res = [ID, score]
+            self.assertEqual(essential.almutem(sign, signlon), res[0])
+            self.assertEqual(almutems[i], res[0])
+
+    def test_compiled_tables(self):
+        """Compiled tables follow the terms and faces variants."""
+        self.check()
+        essential.setTerms(essential.LILLY_TERMS)
+        essential.setFaces(essential.TRIPLICITY_FACES)
+        self.check()
@@ -0,0 +1,215 @@
+import unittest
+
+from flatlib import const
+from flatlib.ephem import eph
+from flatlib.ephem import swe
+
+
+class EphemTests(unittest.TestCase):
+
+    def setUp(self):
+        self.jd = 2457095.2083333335  # 2015/03/13 17:00 UTC
+        self.lat = 38.5333
+        self.lon = -8.9
+
+    def test_objects_batch(self):
+        """Batch positions must match single date positions."""
+        jds = [self.jd + i for i in range(5)]
+        IDs = [const.SUN, const.MOON, const.SATURN]
+        batch = swe.sweObjectsBatch(IDs, jds)
+        for ID in IDs:
+            for i, jd in enumerate(jds):
+                obj = swe.sweObject(ID, jd)
+                for key in ['lon', 'lat', 'lonspeed', 'latspeed']:
+                    self.assertEqual(batch[ID][key][i], obj[key])
+
+    def test_object_arrays_derived(self):
+        """Derived objects are available in batch results."""
+        jds = [self.jd, self.jd + 10]
+        IDs = [const.SOUTH_NODE, const.PARS_FORTUNA]
+        res = eph.getObjectArrays(IDs, jds, self.lat, self.lon)
+        for ID in IDs:
+            for i, jd in enumerate(jds):
+                obj = eph.getObject(ID, jd, self.lat, self.lon)
+                self.assertAlmostEqual(res[ID]['lon'][i], obj['lon'])
+
+    def test_cache(self):
+        """Cached calls must return the same results."""
+        expected = swe.sweObject(const.SUN, self.jd)
+        swe.setCache(16)
+        try:
+            swe.sweObject(const.SUN, self.jd)
+            obj = swe.sweObjectLon(const.SUN, self.jd)
+            self.assertEqual(obj, expected['lon'])
+            self.assertEqual(swe.CACHE.misses, 1)
+            self.assertEqual(swe.CACHE.hits, 1)
+            swe.CACHE.clear()
+            self.assertEqual(len(swe.CACHE), 0)
+        finally:
+            swe.setCache(0)
+            swe.CACHE.clear()
+
+    def test_fixed_star_magnitudes(self):
+        """Indexed magnitudes must match the Swiss Ephemeris."""
+        import swisseph
+        swe.loadStarCatalogue()
+        for ID in const.LIST_FIXED_STARS:
+            expected = swisseph.fixstar2_mag(ID)[0]
+            self.assertEqual(swe.sweFixedStarMag(ID), expected)
+
+    def test_fixed_stars(self):
+        """Batched fixed stars match single computations."""
+        IDs = const.LIST_FIXED_STARS[:5]
+        stars = eph.getFixedStars(IDs, self.jd)
+        for ID, star in zip(IDs, stars):
+            self.assertEqual(star, eph.getFixedStar(ID, self.jd))
+
+    def test_chebyshev_tables(self):
+        """Interpolated positions must be within one arc-second."""
+        from flatlib.ephem.chebyshev import ChebyshevTable
+        IDs = [const.SUN, const.MOON, const.MERCURY]
+        tables = ChebyshevTable.build(IDs, self.jd - 30, self.jd + 30)
+        for ID in IDs:
+            self.assertLess(tables.maxError(ID, 200), 1.0)
+
+        expected = eph.getObject(const.MOON, self.jd, self.lat, self.lon)
+        swe.setTables(tables)
+        try:
+            obj = eph.getObject(const.MOON, self.jd, self.lat, self.lon)
+        finally:
+            swe.setTables(None)
+        self.assertAlmostEqual(obj['lon'], expected['lon'], places=4)
+        self.assertAlmostEqual(obj['lonspeed'], expected['lonspeed'], places=4)
+
+    def test_batch_tables_coverage(self):
+        """Dates outside the tables must not be extrapolated."""
+        from flatlib.ephem.chebyshev import ChebyshevTable
+        IDs = [const.SUN, const.MOON]
+        jds = [self.jd + 1, self.jd + 500, self.jd + 2]
+        expected = swe.sweObjectsBatch(IDs, jds)
+        swe.setTables(ChebyshevTable.build(IDs, self.jd, self.jd + 10))
+        try:
+            res = swe.sweObjectsBatch(IDs, jds)
+            empty = swe.sweObjectsBatch(IDs, [])
+        finally:
+            swe.setTables(None)
+        for ID in IDs:
+            for i in range(len(jds)):
+                self.assertAlmostEqual(res[ID]['lon'][i], 
+                                       expected[ID]['lon'][i], places=4)
+            self.assertEqual(len(empty[ID]), 0)
+            self.assertEqual(empty[ID].dtype, swe.OBJECT_DTYPE)
+
+    def test_ephemeris_file(self):
+        """Memory-mapped tables must match the original tables."""
+        import os
+        import tempfile
+        from flatlib.ephem import ephfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.eph')
+            ephfile.main([path, '2015/03/01', '2015/04/01',
+                          '--objects', const.SUN, const.MOON])
+            tables = ephfile.load(path)
+            for ID in [const.SUN, const.MOON]:
+                obj = swe.sweObject(ID, self.jd)
+                self.assertAlmostEqual(tables.calc(ID, self.jd)[0],
+                                       obj['lon'], places=5)
+            del tables
+
+    def test_stations(self):
+        """Stations must have zero speed and change direction."""
+        from flatlib.ephem import tools
+        stations = list(tools.stationsBetween(const.MERCURY, self.jd,
+                                              self.jd + 365))
+        self.assertEqual(len(stations), 6)
+        for jd in stations:
+            before = swe.sweObject(const.MERCURY, jd - 0.01)['lonspeed']
+            after = swe.sweObject(const.MERCURY, jd + 0.01)['lonspeed']
+            self.assertLess(before * after, 0)
+        self.assertEqual(tools.nextStationJD(const.MERCURY, self.jd),
+                         stations[0])
+
+    def test_events(self):
+        """Events must match the existing iterative algorithms."""
+        from flatlib import angle
+        from flatlib.ephem import events, tools
+        jd = next(events.returns(const.SUN, 100.0, self.jd, self.jd + 400))
+        self.assertAlmostEqual(jd, tools.solarReturnJD(self.jd, 100.0), places=3)
+
+        ingresses = list(events.ingresses(const.SUN, self.jd, self.jd + 365))
+        self.assertEqual(len(ingresses), 12)
+        self.assertEqual(ingresses[0][1], const.ARIES)
+
+        syzygies = list(events.aspectsExact(const.SUN, const.MOON, [0, 180],
+                                            self.jd - 30, self.jd))
+        jd, asp = syzygies[-1]
+        self.assertAlmostEqual(jd, tools.syzygyJD(self.jd), places=3)
+        sun = swe.sweObjectLon(const.SUN, jd)
+        moon = swe.sweObjectLon(const.MOON, jd)
+        self.assertAlmostEqual(abs(angle.closestdistance(sun, moon)), asp, places=5)
+
+    def test_lunations(self):
+        """Indexed syzygies must match the iterative search."""
+        import os
+        import tempfile
+        from flatlib.ephem import lunations, tools
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lunations.npz')
+            lunations.main([path, '2015/01/01', '2016/01/01'])
+            index = lunations.LunationIndex.load(path)
+        self.assertEqual(len(index.jds), 25)
+        jds = [self.jd + i * 3.3 for i in range(60)]
+        expected = [tools.syzygyJD(jd) for jd in jds]
+        outside = tools.syzygyJD(self.jd + 1000)
+        tools.setLunations(index)
+        try:
+            for jd, szjd in zip(jds, expected):
+                self.assertAlmostEqual(tools.syzygyJD(jd), szjd, places=3)
+            self.assertFalse(index.covers(self.jd + 1000))
+            self.assertEqual(tools.syzygyJD(self.jd + 1000), outside)
+        finally:
+            tools.setLunations(None)
+
+    def test_eclipses(self):
+        """Catalogue queries must match the Swiss Ephemeris."""
+        import os
+        import tempfile
+        from flatlib.ephem import eclipses
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lunar.npz')
+            eclipses.main([path, swe.LUNAR_ECLIPSE, '2010/01/01', '2020/01/01'])
+            catalogue = eclipses.EclipseCatalogue.load(path)
+
+        jds = [self.jd + i * 97.1 for i in range(-20, 20)]
+        expected = [(swe.lunarEclipseGlobal(jd, True),
+                     swe.lunarEclipseGlobal(jd, False)) for jd in jds]
+        swe.setEclipses(catalogue)
+        try:
+            for jd, (prev, next_) in zip(jds, expected):
+                self.assertEqual(swe.lunarEclipseGlobal(jd, True), prev)
+                self.assertEqual(swe.lunarEclipseGlobal(jd, False), next_)
+            between = eclipses.eclipsesBetween(swe.LUNAR_ECLIPSE, self.jd,
+                                               self.jd + 1000)
+        finally:
+            swe.clearEclipses()
+        self.assertEqual(between, eclipses.eclipsesBetween(
+            swe.LUNAR_ECLIPSE, self.jd, self.jd + 1000))
+
+    def test_hour_tables(self):
+        """Hour tables of a range must match single tables."""
+        from flatlib.datetime import Datetime
+        from flatlib.geopos import GeoPos
+        from flatlib.tools import planetarytime
+        pos = GeoPos(self.lat, self.lon)
+        start = Datetime.fromJD(self.jd, '+00:00')
+        end = Datetime.fromJD(self.jd + 6, '+00:00')
+        tables = planetarytime.getHourTables(start, end, pos)
+        self.assertEqual(len(tables), 7)
+        for table in tables:
+            sunrise = table.table[0][0]
+            self.assertLess(sunrise, table.table[12][0])
+            date = Datetime.fromJD(sunrise + 0.25, '+00:00')
+            single = planetarytime.getHourTable(date, pos)
+            for entry, other in zip(table.table, single.table):
+                self.assertAlmostEqual(entry[0], other[0], places=6)
+                self.assertEqual(entry[2], other[2])
@@ -0,0 +1,193 @@
+import unittest
+from itertools import islice
+
+import numpy as np
+
+from flatlib import angle
+from flatlib import aspects
+from flatlib import const
+from flatlib.chart import Chart
+from flatlib.datetime import Datetime
+from flatlib.ephem import ephem
+from flatlib.ephem import swe
+from flatlib.geopos import GeoPos
+from flatlib.predictives import primarydirections
+from flatlib.predictives import profections
+from flatlib.predictives import returns
+from flatlib.predictives import transits
+from flatlib.predictives.primarydirections import PrimaryDirections, PDTable
+
+
+class PredictivesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.date = Datetime('2015/03/13', '17:00', '+00:00')
+        self.pos = GeoPos('38n32', '8w54')
+
+    def test_return_series(self):
+        """Return series must match single return searches."""
+        chart = Chart(self.date, self.pos)
+        start = Datetime('2016/01/01', '00:00', '+00:00')
+        end = Datetime('2019/01/01', '00:00', '+00:00')
+        series = list(returns.returnSeries(chart, const.SUN, start, end))
+        self.assertEqual(len(series), 3)
+        srChart = returns.nextSolarReturn(chart, start)
+        self.assertAlmostEqual(series[0].date.jd, srChart.date.jd, places=3)
+
+        lunar = list(returns.returnSeries(chart, const.MOON, start, end))
+        self.assertEqual(len(lunar), 40)
+        moon = lunar[0].getChart().getObject(const.MOON)
+        self.assertAlmostEqual(moon.lon, chart.getObject(const.MOON).lon, places=5)
+
+        end = Datetime('2040/01/01', '00:00', '+00:00')
+        nodes = list(returns.returnSeries(chart, const.SOUTH_NODE, start, end))
+        self.assertEqual(len(nodes), 1)
+        node = nodes[0].getChart().getObject(const.SOUTH_NODE)
+        self.assertAlmostEqual(node.lon, chart.getObject(const.SOUTH_NODE).lon,
+                               places=5)
+
+    def test_transits(self):
+        """Exact transit events must be exact aspects."""
+        chart = Chart(self.date, self.pos)
+        start = Datetime('2016/01/01', '00:00', '+00:00')
+        end = Datetime('2016/03/01', '00:00', '+00:00')
+        found = list(transits.scan(chart, [const.MARS], const.MAJOR_ASPECTS,
+                                   start, end))
+        self.assertTrue(found)
+        jds = [event['jd'] for event in found]
+        self.assertEqual(jds, sorted(jds))
+        for event in found:
+            natal = chart.get(event['natal'])
+            lon = swe.sweObjectLon(event['transit'], event['jd'])
+            sep = abs(angle.closestdistance(natal.lon, lon))
+            if event['event'] == transits.EXACT:
+                self.assertAlmostEqual(sep, event['type'], places=4)
+            else:
+                orb = max(8, natal.orb())
+                self.assertAlmostEqual(abs(sep - event['type']), orb, places=4)
+
+    def test_transits_all_aspects(self):
+        """Events must match a brute force count of crossings."""
+        chart = Chart(self.date, self.pos)
+        sun = chart.getObject(const.SUN)
+        start = Datetime('2016/01/01', '00:00', '+00:00')
+        end = Datetime('2016/03/01', '00:00', '+00:00')
+        jds = np.arange(start.jd, end.jd, 0.01)
+        for ID in [const.MARS, const.MOON]:
+            found = [event for event in transits.scan(
+                chart, [ID], const.ALL_ASPECTS, start, end)
+                if event['natal'] == const.SUN]
+            transit = ephem.getObject(ID, start, self.pos)
+            levels = np.array([level[0] for level in transits._levels(
+                transit, sun, const.ALL_ASPECTS)])
+            dist = np.array([swe.sweObjectLon(ID, jd) for jd in jds]) - sun.lon
+            f = np.mod(dist[:, None] - levels[None, :] + 180, 360) - 180
+            fa, fb = f[:-1], f[1:]
+            count = np.sum((fa * fb <= 0) & (fa != 0) & (np.abs(fa - fb) < 180))
+            self.assertEqual(len(found), count)
+
+    def test_transits_nodes(self):
+        """Transiting nodes follow the rules of getAspect."""
+        chart = Chart(self.date, self.pos)
+        start = Datetime('2020/01/01', '00:00', '+00:00')
+        end = Datetime('2022/01/01', '00:00', '+00:00')
+        found = [event for event in transits.scan(
+            chart, [const.NORTH_NODE], [90], start, end)
+            if event['natal'] == const.SUN and event['event'] == transits.EXACT]
+        self.assertTrue(found)
+        node = ephem.getObject(const.NORTH_NODE, found[0]['date'], self.pos)
+        aspect = aspects.getAspect(node, chart.getObject(const.SUN), [90])
+        self.assertEqual(aspect.type, 90)
+
+    def test_transits_south_node(self):
+        """South Node transits mirror the North Node."""
+        chart = Chart(self.date, self.pos)
+        start = Datetime('2016/01/01', '00:00', '+00:00')
+        end = Datetime('2017/01/01', '00:00', '+00:00')
+        south = list(transits.scan(chart, [const.SOUTH_NODE], [0],
+                                   start, end))
+        self.assertTrue(south)
+        for event in south:
+            if event['event'] == transits.EXACT:
+                natal = chart.get(event['natal'])
+                north = swe.sweObjectLon(const.NORTH_NODE, event['jd'])
+                sep = angle.closestdistance(natal.lon, north)
+                self.assertAlmostEqual(abs(sep), 180, places=4)
+        with self.assertRaises(ValueError):
+            list(transits.scan(chart, [const.PARS_FORTUNA], [0], start, end))
+
+    def test_primary_directions(self):
+        """Vectorized arcs must match the arc of each pair."""
+        chart = Chart(self.date, self.pos)
+        pd = PrimaryDirections(chart)
+        table = pd.getList(const.MAJOR_ASPECTS)
+        self.assertEqual(table, sorted(table))
+        for (arc, promID, sigID, mode) in table:
+            if not promID.startswith('N_'):
+                continue
+            ID, asp = promID[2:].rsplit('_', 1)
+            prom = pd.N(ID, int(asp))
+            sig = pd.N(sigID[2:].rsplit('_', 1)[0])
+            arcs = pd.getArc(prom, sig)
+            key = 'arcm' if mode == 'M' else 'arcz'
+            self.assertAlmostEqual(arcs[key], arc, places=9)
+
+    def test_pd_table_index(self):
+        """Indexed table queries must match linear scans."""
+        table = PDTable(Chart(self.date, self.pos))
+        self.assertEqual(table.view(10, 30),
+                         [d for d in table.table if 10 < d[0] < 30])
+        self.assertEqual(table.bySignificator(const.SUN),
+                         [d for d in table.table if const.SUN in d[2]])
+        self.assertEqual(table.byPromissor('N_Mars_90'),
+                         [d for d in table.table if d[1] == 'N_Mars_90'])
+        self.assertEqual(
+            table.filter(5, 60, sig=const.MOON, prom=const.MARS, mode='Z'),
+            [d for d in table.table if 5 < d[0] < 60 and const.MOON in d[2]
+             and const.MARS in d[1] and d[3] == 'Z'])
+
+    def test_pd_iter_list(self):
+        """Lazy directions must follow the order of getList."""
+        pd = PrimaryDirections(Chart(self.date, self.pos))
+        table = pd.getList(const.MAJOR_ASPECTS)
+        self.assertEqual(list(pd.iterList(const.MAJOR_ASPECTS)), table)
+        self.assertEqual(list(islice(pd.iterList(const.MAJOR_ASPECTS), 10)),
+                         table[:10])
+        self.assertEqual(list(pd.iterList(const.MAJOR_ASPECTS, 30)),
+                         [d for d in table if d[0] < 30])
+
+    def test_pd_time_keys(self):
+        """Time keys must map arcs to increasing dates."""
+        chart = Chart(self.date, self.pos)
+        table = PDTable(chart)
+        ptolemy = table.getTimeKey(primarydirections.PTOLEMY)
+        self.assertAlmostEqual(ptolemy.toJD([10])[0],
+                               chart.date.jd + 10 * primarydirections.YEAR, places=6)
+        solarArc = table.getTimeKey(primarydirections.SOLAR_ARC)
+        self.assertIs(solarArc, table.getTimeKey(primarydirections.SOLAR_ARC))
+        jds = [date.jd for date in table.dates(primarydirections.SOLAR_ARC)]
+        self.assertEqual(jds, sorted(jds))
+        self.assertEqual(len(jds), len(table.table))
+
+    def test_profection_timeline(self):
+        """Timeline views must match profection charts."""
+        chart = Chart(self.date, self.pos)
+        start = Datetime('2020/01/01', '00:00', '+00:00')
+        end = Datetime('2022/01/01', '00:00', '+00:00')
+        views = list(profections.profectionTimeline(chart, start, end, 90))
+        self.assertEqual(len(views), 9)
+        for view in views:
+            pChart = profections.compute(chart, view.date)
+            for ID in [const.SUN, const.MOON, const.ASC, const.HOUSE10]:
+                self.assertAlmostEqual(view.get(ID).lon, pChart.get(ID).lon,
+                                       places=4)
+
+        fixed = profections.profectionTimeline(chart, start, end, 90,
+                                               fixedObjects=True)
+        for view in fixed:
+            pChart = profections.compute(chart, view.date, fixedObjects=True)
+            for ID in [const.SUN, const.ASC]:
+                self.assertAlmostEqual(view.get(ID).lon, pChart.get(ID).lon,
+                                       places=4)
+            self.assertEqual(view.get(const.SUN).lon,
+                             chart.getObject(const.SUN).lon)